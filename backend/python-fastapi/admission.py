@@ -0,0 +1,212 @@
+# FitSync AI - Admission control and load shedding
+# Per-class concurrency limits with bounded, deadline-limited queues
+
+import asyncio
+import logging
+import math
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Priority classes; critical routes (probes, auth) bypass admission entirely
+CRITICAL = "critical"
+STANDARD = "standard"
+LLM = "llm"
+
+
+@dataclass(frozen=True)
+class AdmissionClass:
+    max_concurrency: int   # requests executing at once
+    max_queue: int         # requests allowed to wait for a slot
+    queue_timeout: float   # seconds a queued request waits before it is shed
+
+
+DEFAULT_CLASSES: Dict[str, AdmissionClass] = {
+    LLM: AdmissionClass(
+        max_concurrency=int(os.getenv("ADMISSION_LLM_CONCURRENCY", "32")),
+        max_queue=int(os.getenv("ADMISSION_LLM_QUEUE", "64")),
+        queue_timeout=float(os.getenv("ADMISSION_LLM_QUEUE_TIMEOUT", "2")),
+    ),
+    STANDARD: AdmissionClass(
+        max_concurrency=int(os.getenv("ADMISSION_STANDARD_CONCURRENCY", "256")),
+        max_queue=int(os.getenv("ADMISSION_STANDARD_QUEUE", "512")),
+        queue_timeout=float(os.getenv("ADMISSION_STANDARD_QUEUE_TIMEOUT", "5")),
+    ),
+}
+
+MAX_CACHED_PATHS = 1024
+
+
+class _ClassState:
+    __slots__ = ("in_flight", "waiters", "admitted", "shed", "degraded", "timed_out")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.degraded = 0
+        self.timed_out = 0
+
+
+class AdmissionController:
+    """Tracks in-flight work per priority class and decides admission.
+
+    A request runs immediately when its class has a free slot, waits in a
+    bounded FIFO queue up to the class deadline otherwise, and is rejected
+    when the queue is full or the deadline passes. Released slots are handed
+    directly to the oldest waiter.
+    """
+
+    def __init__(self, classes: Dict[str, AdmissionClass] = DEFAULT_CLASSES):
+        self.classes = classes
+        self._states = {name: _ClassState() for name in classes}
+
+    async def acquire(self, name: str) -> bool:
+        """Take a slot in the class, waiting in its queue; False means shed"""
+        cls = self.classes[name]
+        state = self._states[name]
+        if state.in_flight < cls.max_concurrency and not state.waiters:
+            state.in_flight += 1
+            state.admitted += 1
+            return True
+        if len(state.waiters) >= cls.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        try:
+            # A granted waiter inherits the releasing request's slot
+            await asyncio.wait_for(waiter, cls.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                state.timed_out += 1
+                return False
+        except asyncio.CancelledError:
+            # Client went away; give back a slot granted at the same moment
+            if waiter.done() and not waiter.cancelled():
+                self.release(name)
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+        state.admitted += 1
+        return True
+
+    def release(self, name: str):
+        state = self._states[name]
+        while state.waiters:
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        state.in_flight -= 1
+
+    def record(self, name: str, outcome: str):
+        """Count a rejected request under the "shed" or "degraded" outcome"""
+        state = self._states[name]
+        setattr(state, outcome, getattr(state, outcome) + 1)
+
+    def retry_after(self, name: str) -> int:
+        return max(1, math.ceil(self.classes[name].queue_timeout))
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {
+                "in_flight": state.in_flight,
+                "queued": len(state.waiters),
+                "max_concurrency": self.classes[name].max_concurrency,
+                "admitted": state.admitted,
+                "shed": state.shed,
+                "degraded": state.degraded,
+                "timed_out": state.timed_out,
+            }
+            for name, state in self._states.items()
+        }
+
+    def render_metrics(self) -> str:
+        """Prometheus text exposition of queue depth and shed counts"""
+        gauges = ("in_flight", "queued", "max_concurrency")
+        lines = []
+        snapshot = self.snapshot()
+        for metric in next(iter(snapshot.values()), {}):
+            kind = "gauge" if metric in gauges else "counter"
+            suffix = "" if kind == "gauge" else "_total"
+            lines.append(f"# TYPE admission_{metric}{suffix} {kind}")
+            for name, values in snapshot.items():
+                lines.append(f'admission_{metric}{suffix}{{class="{name}"}} {values[metric]}')
+        return "\n".join(lines) + "\n"
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying admission control by route class.
+
+    ``routes`` maps path prefixes to class names, checked in order; unmatched
+    paths are STANDARD. Paths in ``degrade`` are admitted without a slot and
+    flagged on ``request.state.degraded`` instead of being shed, so the
+    endpoint can serve a cheap fallback.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        controller: AdmissionController,
+        routes: Sequence[Tuple[str, str]] = (),
+        degrade: Iterable[str] = (),
+    ):
+        self.app = app
+        self.controller = controller
+        self.routes = list(routes)
+        self.degrade = frozenset(degrade)
+        self._path_classes: Dict[str, str] = {}
+
+    def classify(self, path: str) -> str:
+        name = self._path_classes.get(path)
+        if name is None:
+            name = next((cls for prefix, cls in self.routes if path.startswith(prefix)), STANDARD)
+            if len(self._path_classes) < MAX_CACHED_PATHS:
+                self._path_classes[path] = name
+        return name
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = self.classify(scope["path"])
+        if name not in self.controller.classes:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(name):
+            if scope["path"] in self.degrade:
+                self.controller.record(name, "degraded")
+                scope.setdefault("state", {})["degraded"] = True
+                await self.app(scope, receive, send)
+                return
+            self.controller.record(name, "shed")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Service overloaded, please retry"},
+                headers={"Retry-After": str(self.controller.retry_after(name))},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
+
+
+def is_degraded(request: Request) -> bool:
+    """True when admission control asked this request to use its fallback path"""
+    return getattr(request.state, "degraded", False)
@@ -0,0 +1,70 @@
+# FitSync AI - Calorie engine benchmark
+# Usage: python benchmarks/bench_calories.py [workouts]
+# Scores a synthetic history of completed workouts (six exercises each):
+# columnar arrays as analytics would load them, and plan dicts through the
+# batch re-score API.
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calorie_engine import ExerciseBatch, calorie_engine  # noqa: E402
+from exercise_catalog import EXERCISES  # noqa: E402
+
+EXERCISES_PER_WORKOUT = 6
+
+
+def synthetic_batch(workouts: int, seed: int = 7) -> ExerciseBatch:
+    rng = np.random.default_rng(seed)
+    rows = workouts * EXERCISES_PER_WORKOUT
+    timed = rng.random(rows) < 0.25
+    return ExerciseBatch(
+        index=rng.integers(0, len(EXERCISES), rows, dtype=np.int32),
+        sets=rng.integers(1, 6, rows).astype(np.float32),
+        reps=np.where(timed, 0, rng.integers(6, 16, rows)).astype(np.float32),
+        timed_seconds=np.where(timed, rng.integers(20, 60, rows), 0).astype(np.float32),
+        rest_seconds=rng.choice([15, 30, 60, 90], rows).astype(np.float32),
+        workout=np.repeat(np.arange(workouts, dtype=np.int32), EXERCISES_PER_WORKOUT),
+    )
+
+
+def synthetic_plans(workouts: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    reps = ["8-12", "6-10", "10-15", "30 seconds", "12"]
+    return [
+        [
+            {
+                "id": EXERCISES[rng.integers(len(EXERCISES))]["id"],
+                "sets": int(rng.integers(1, 6)),
+                "reps": reps[rng.integers(len(reps))],
+                "rest_seconds": 60,
+            }
+            for _ in range(EXERCISES_PER_WORKOUT)
+        ]
+        for _ in range(workouts)
+    ]
+
+
+if __name__ == "__main__":
+    workouts = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(11)
+    batch = synthetic_batch(workouts)
+    weight = rng.uniform(50, 110, workouts).astype(np.float32)
+    duration = rng.integers(20, 90, workouts)
+
+    start = time.perf_counter()
+    totals = calorie_engine.workout_totals(batch, weight, duration, workouts=workouts)
+    elapsed = time.perf_counter() - start
+    print(f"columnar: {workouts:,} workouts ({len(batch):,} exercises) in {elapsed:.2f} s"
+          f"  ({workouts / elapsed / 1e6:.1f}M workouts/s, mean {totals.mean():.0f} kcal)")
+
+    for count in (1, 1_000, 100_000):
+        plans = synthetic_plans(count)
+        start = time.perf_counter()
+        calorie_engine.score_history(plans, 75.0, 45)
+        elapsed = time.perf_counter() - start
+        print(f"score_history: {count:>7,} plan dicts in {elapsed * 1000:9.2f} ms")
@@ -0,0 +1,56 @@
+# FitSync AI - Nutrition engine benchmark across catalog sizes
+# Usage: python benchmarks/bench_nutrition_engine.py [iterations]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nutrition_engine import (  # noqa: E402
+    DEFAULT_MACRO_SPLIT, FOOD_DATABASE, FoodTable, NutritionEngine, macro_grams,
+)
+
+CATALOG_SIZES = [len(FOOD_DATABASE), 1_000, 10_000, 100_000]
+SCENARIOS = [
+    ("omnivore, 3 meals", 2200, 3, [], []),
+    ("vegan, 4 meals", 2000, 4, ["vegan"], ["mexican"]),
+    ("gluten/dairy free, 6 meals", 2600, 6, ["gluten_free", "dairy_free"], ["fish"]),
+]
+
+
+def synthetic_table(size: int, seed: int = 7) -> FoodTable:
+    """Tile the seed foods with +/-15% macro noise up to the requested size"""
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(size):
+        name, serving, kcal, protein, carbs, fat, diet, meals, tags = FOOD_DATABASE[i % len(FOOD_DATABASE)]
+        if i >= len(FOOD_DATABASE):
+            scale = rng.uniform(0.85, 1.15, 3)
+            name = f"{name} #{i // len(FOOD_DATABASE)}"
+            energy = 4 * protein + 4 * carbs + 9 * fat
+            protein, carbs, fat = protein * scale[0], carbs * scale[1], fat * scale[2]
+            # Keep calories consistent with the perturbed macros
+            kcal = kcal * (4 * protein + 4 * carbs + 9 * fat) / max(energy, 1.0)
+        records.append((name, serving, kcal, protein, carbs, fat, diet, meals, tags))
+    return FoodTable.from_records(records)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for size in CATALOG_SIZES:
+        build_start = time.perf_counter()
+        engine = NutritionEngine(synthetic_table(size))
+        build_ms = (time.perf_counter() - build_start) * 1000
+        print(f"catalog={size:>7}  build={build_ms:8.1f} ms")
+        for label, calories, meal_count, restrictions, preferences in SCENARIOS:
+            targets = macro_grams(calories, DEFAULT_MACRO_SPLIT)
+            args = (calories, targets["protein"], targets["carbs"], targets["fat"], meal_count, restrictions, preferences)
+            plan = engine.plan_day(*args)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                engine.plan_day(*args)
+            per_plan_ms = (time.perf_counter() - start) / iterations * 1000
+            print(f"  {label:<28} {per_plan_ms:7.3f} ms/plan  kcal={plan['daily_calories']} (target {calories})")
@@ -0,0 +1,107 @@
+# FitSync AI - ID generation and plan history paging benchmark
+# Usage: python benchmarks/bench_plan_history.py [plans_per_user]
+# Seeds one heavy user (100k plans by default) among lighter users and pages
+# through their history with OFFSET versus the keyset query from history.py.
+# Uses in-memory SQLite unless BENCH_DATABASE_URL points at a synchronous
+# SQLAlchemy URL (e.g. postgresql+psycopg2://...).
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from history import Base, PlanHistory, keyset_query  # noqa: E402
+from ids import IdGenerator, encode_id  # noqa: E402
+
+HEAVY_USER = 1
+LIGHT_USERS = 200
+PAGE = 20
+DEPTHS = (0, 1_000, 10_000, 50_000, 99_000)
+BATCH = 10_000
+
+
+def bench_ids(threads: int = 4, per_thread: int = 200_000) -> None:
+    generator = IdGenerator(worker_id=1)
+    start = time.perf_counter()
+    for _ in range(per_thread):
+        generator.next_id()
+    single = per_thread / (time.perf_counter() - start)
+
+    results = [[] for _ in range(threads)]
+
+    def mint(bucket):
+        bucket.extend(generator.next_id() for _ in range(per_thread))
+
+    workers = [threading.Thread(target=mint, args=(results[i],)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    minted = [value for bucket in results for value in bucket]
+    ordered = all(all(a < b for a, b in zip(bucket, bucket[1:])) for bucket in results)
+    print(f"ids: {single / 1e6:.2f}M/s single thread; {len(minted):,} minted across {threads} threads, "
+          f"{len(minted) - len(set(minted))} duplicates, per-thread monotonic={ordered}")
+
+
+def seed(engine, plans: int) -> None:
+    generator = IdGenerator(worker_id=2)
+    Base.metadata.create_all(engine)
+    users = [HEAVY_USER] * plans + [2 + i % LIGHT_USERS for i in range(plans)]
+    with engine.begin() as conn:
+        for offset in range(0, len(users), BATCH):
+            rows = []
+            for user_id in users[offset:offset + BATCH]:
+                plan_id = generator.next_id()
+                rows.append({
+                    "id": plan_id,
+                    "user_id": user_id,
+                    "kind": "workout",
+                    "plan_key": f"workout_{user_id}_{encode_id(plan_id)}",
+                    "name": "AI-Generated Strength Workout",
+                    "body": "{}",
+                })
+            conn.execute(insert(PlanHistory), rows)
+
+
+def timed(session: Session, query, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = list(session.execute(query).scalars())
+    return (time.perf_counter() - start) / repeat * 1000, rows
+
+
+def main(plans: int) -> None:
+    bench_ids()
+    engine = create_engine(os.getenv("BENCH_DATABASE_URL", "sqlite://"))
+    start = time.perf_counter()
+    seed(engine, plans)
+    print(f"seeded {2 * plans:,} plans ({plans:,} for user {HEAVY_USER}) in {time.perf_counter() - start:.1f} s")
+
+    kind = PlanHistory.kind == "workout"
+    with Session(engine) as session:
+        # Cursor at each depth: the id of the row just above the page
+        ids = list(session.execute(
+            select(PlanHistory.id).where(PlanHistory.user_id == HEAVY_USER, kind).order_by(PlanHistory.id.desc())
+        ).scalars())
+        for depth in DEPTHS:
+            if depth >= len(ids):
+                continue
+            offset_query = (
+                select(PlanHistory).where(PlanHistory.user_id == HEAVY_USER, kind)
+                .order_by(PlanHistory.id.desc()).offset(depth).limit(PAGE)
+            )
+            cursor = encode_id(ids[depth - 1]) if depth else None
+            offset_ms, offset_rows = timed(session, offset_query)
+            keyset_ms, keyset_rows = timed(session, keyset_query(PlanHistory, HEAVY_USER, PAGE, cursor, kind))
+            assert [row.id for row in offset_rows] == [row.id for row in keyset_rows]
+            print(f"page at depth {depth:>6,}: OFFSET {offset_ms:8.3f} ms   keyset {keyset_ms:6.3f} ms")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
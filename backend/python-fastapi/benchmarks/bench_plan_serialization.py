@@ -0,0 +1,129 @@
+# FitSync AI - Plan response serialization benchmark
+# Usage: python benchmarks/bench_plan_serialization.py [iterations]
+# Compares FastAPI's response_model pipeline (validate, jsonable_encoder,
+# json.dumps, GZipMiddleware) against pre-encoded plan bytes, driving both
+# through the ASGI stack in-process.
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.gzip import GZipMiddleware  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from exercise_catalog import EXERCISES  # noqa: E402
+from plan_codec import EncodedPlan  # noqa: E402
+
+
+class WorkoutPlan(BaseModel):
+    # Same shape as WorkoutPlan in enhanced-main.py
+    id: str
+    name: str
+    description: str
+    duration_minutes: int
+    difficulty: str
+    exercises: List[Dict[str, Any]]
+    estimated_calories: int
+    target_muscle_groups: List[str]
+    equipment_needed: List[str]
+    created_at: datetime
+
+
+def sample_plan() -> WorkoutPlan:
+    exercises = [
+        {
+            "id": exercise["id"],
+            "name": exercise["name"],
+            "muscle_groups": exercise["muscle_groups"],
+            "equipment": exercise["equipment"],
+            "sets": 3,
+            "reps": "8-12",
+            "rest_seconds": 60,
+            "instructions": f"Perform {exercise['name']} focusing on proper form",
+            "difficulty": exercise["difficulty"],
+        }
+        for exercise in EXERCISES[:8]
+    ]
+    return WorkoutPlan(
+        id="workout_1_1700000000",
+        name="AI-Generated Strength Workout",
+        description="Personalized intermediate level strength workout",
+        duration_minutes=45,
+        difficulty="intermediate",
+        exercises=exercises,
+        estimated_calories=315,
+        target_muscle_groups=["chest", "legs"],
+        equipment_needed=["dumbbells"],
+        created_at=datetime.utcnow(),
+    )
+
+
+def build_app(plan: WorkoutPlan) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    cached = EncodedPlan.from_dict(plan.dict())
+
+    @app.get("/model", response_model=WorkoutPlan)
+    async def model_response():
+        return plan
+
+    @app.get("/encode_once", response_model=WorkoutPlan)
+    async def encode_once(http_request: Request):
+        # Generation path: encode and compress the fresh plan once
+        encoded = EncodedPlan.from_dict(plan.dict())
+        return encoded.response(http_request.headers.get("accept-encoding"))
+
+    @app.get("/cached", response_model=WorkoutPlan)
+    async def cached_read(http_request: Request):
+        # Repeated read path: bytes straight from the cache
+        return cached.response(http_request.headers.get("accept-encoding"))
+
+    return app
+
+
+async def call(app: FastAPI, path: str, accept_encoding: bytes) -> int:
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding)], "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size
+
+
+async def bench(app: FastAPI, path: str, accept_encoding: bytes, iterations: int) -> None:
+    size = await call(app, path, accept_encoding)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app, path, accept_encoding)
+    per_call_us = (time.perf_counter() - start) / iterations * 1e6
+    label = f"{path} ({accept_encoding.decode() or 'identity'})"
+    print(f"{label:<28} {per_call_us:8.1f} us/response  {size:6d} bytes")
+
+
+async def main(iterations: int) -> None:
+    app = build_app(sample_plan())
+    for accept_encoding in (b"gzip", b""):
+        for path in ("/model", "/encode_once", "/cached"):
+            await bench(app, path, accept_encoding, iterations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,81 @@
+# FitSync AI - Rate limiter overhead benchmark
+# Usage: python benchmarks/bench_rate_limit.py [users]
+# Drives RateLimiter.check() with the production ROUTE_LIMITS: every user
+# spends their full burst on each route, then one more request is denied.
+# Set REDIS_URL to run against a live Redis; otherwise fakeredis is used
+# when installed (it only counts round trips meaningfully, not latency).
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limit import ROUTE_LIMITS, RateLimiter  # noqa: E402
+
+
+class CountingClient:
+    """Wraps a Redis client and counts the limiter's script calls (one per round trip)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.round_trips = 0
+
+    async def evalsha(self, *args, **kwargs):
+        self.round_trips += 1
+        return await self.client.evalsha(*args, **kwargs)
+
+    async def eval(self, *args, **kwargs):
+        self.round_trips += 1
+        return await self.client.eval(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def connect():
+    url = os.getenv("REDIS_URL")
+    if url:
+        import redis.asyncio as redis
+        return redis.Redis.from_url(url, decode_responses=True), url
+    try:
+        import fakeredis
+    except ImportError:
+        return None, None
+    return fakeredis.FakeAsyncRedis(decode_responses=True), "fakeredis"
+
+
+async def bench_routes(users: int) -> None:
+    client, target = connect()
+    if client is None:
+        print("Set REDIS_URL (or install fakeredis) to run the benchmark")
+        return
+    counting = CountingClient(client)
+    limiter = RateLimiter(lambda _: counting, daily_token_quota=0)
+    print(f"{users} users per route against {target}")
+
+    for route, limit in ROUTE_LIMITS.items():
+        burst = limit.burst or limit.limit
+        await client.delete(*(f"ratelimit:{route}:bench_{user}" for user in range(users)))
+        counting.round_trips = 0
+        allowed = denied = 0
+        start = time.perf_counter()
+        for user in range(users):
+            for _ in range(burst + 1):
+                if await limiter.check(f"bench_{user}", route) == 0:
+                    allowed += 1
+                else:
+                    denied += 1
+        decisions = allowed + denied
+        per_call_us = (time.perf_counter() - start) / decisions * 1e6
+        print(
+            f"{route:<17} {limit.limit:>3}/{limit.period:.0f}s lease={limit.lease_size:<2} "
+            f"{per_call_us:7.2f} us/decision  round_trips={counting.round_trips}/{decisions} "
+            f"({1 - counting.round_trips / decisions:.0%} local)  allowed={allowed} denied={denied}"
+        )
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_routes(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
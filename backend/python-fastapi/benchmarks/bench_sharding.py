@@ -0,0 +1,115 @@
+# FitSync AI - Sharded user state throughput benchmark
+# Usage: python benchmarks/bench_sharding.py [seconds] [load_processes]
+# Starts four local redis-server processes (ports 7001-7004) when redis-server
+# is on PATH, or uses REDIS_SHARD_URLS=redis://h:p,... (at least four). Runs
+# the same user-state workload against 1, 2 and 4 shards. Ring balance and
+# remap figures need no Redis. Scaling is only meaningful with at least as
+# many CPU cores as shards plus load processes.
+
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sharding import HashRing, RedisShards  # noqa: E402
+
+PORTS = (7001, 7002, 7003, 7004)
+USERS = 100_000
+CONCURRENCY = 64
+
+
+def ring_stats() -> None:
+    users = [str(i) for i in range(USERS)]
+    for count in (2, 4, 8):
+        ring = HashRing([f"node{i}" for i in range(count)])
+        load = Counter(ring.node_for(user) for user in users)
+        skew = max(load.values()) / (USERS / count)
+        grown = HashRing([f"node{i}" for i in range(count + 1)])
+        moved = sum(ring.node_for(user) != grown.node_for(user) for user in users) / USERS
+        print(f"ring {count} nodes: max/mean load {skew:.3f}, adding a node remaps {moved:.1%} (ideal {1 / (count + 1):.1%})")
+
+
+async def _user_ops(shards: RedisShards, deadline: float) -> int:
+    # One request's worth of user state: profile read, preference counters, chat append
+    ops = 0
+    while time.monotonic() < deadline:
+        user = random.randrange(USERS)
+        client = shards.client(user)
+        await client.hgetall(f"user:{user}")
+        pipe = client.pipeline(transaction=False)
+        pipe.hincrbyfloat(f"user_prefs:{user}", "n", 1.0)
+        pipe.hincrbyfloat(f"user_prefs:{user}", "wt:strength", 1.0)
+        pipe.rpush(f"chat_history:{user}", "turn")
+        pipe.ltrim(f"chat_history:{user}", -12, -1)
+        await pipe.execute()
+        ops += 1
+    return ops
+
+
+def _load_process(urls, seconds: float, results) -> None:
+    async def run():
+        shards = RedisShards(urls)
+        deadline = time.monotonic() + seconds
+        try:
+            counts = await asyncio.gather(*(_user_ops(shards, deadline) for _ in range(CONCURRENCY)))
+        finally:
+            await shards.close()
+        results.put(sum(counts))
+    asyncio.run(run())
+
+
+def throughput(urls, seconds: float, processes: int) -> float:
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_load_process, args=(urls, seconds, results)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    total = sum(results.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    return total / seconds
+
+
+def start_local_redis():
+    binary = shutil.which("redis-server")
+    if binary is None:
+        return [], []
+    servers = [
+        subprocess.Popen([binary, "--port", str(port), "--save", "", "--appendonly", "no"], stdout=subprocess.DEVNULL)
+        for port in PORTS
+    ]
+    time.sleep(0.5)
+    return [f"redis://127.0.0.1:{port}" for port in PORTS], servers
+
+
+def main(seconds: float, processes: int) -> None:
+    ring_stats()
+    urls = [url for url in os.getenv("REDIS_SHARD_URLS", "").split(",") if url]
+    servers = []
+    if len(urls) < 4:
+        urls, servers = start_local_redis()
+    if len(urls) < 4:
+        print("redis-server not found and REDIS_SHARD_URLS not set; skipping throughput runs")
+        return
+    try:
+        baseline = None
+        for count in (1, 2, 4):
+            rate = throughput(urls[:count], seconds, processes)
+            baseline = baseline or rate
+            print(f"{count} shard(s): {rate:10.0f} user requests/s  ({rate / baseline:.2f}x, ideal {count}x)")
+    finally:
+        for server in servers:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 5.0,
+        int(sys.argv[2]) if len(sys.argv) > 2 else max(2, (os.cpu_count() or 2) - 4),
+    )
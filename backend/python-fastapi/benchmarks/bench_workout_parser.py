@@ -0,0 +1,46 @@
+# FitSync AI - Workout response parser benchmark
+# Usage: python benchmarks/bench_workout_parser.py [iterations]
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workout_parser import parse_workout_json  # noqa: E402
+
+SAMPLE_RESPONSES = {
+    "clean": {"exercises": [
+        {"name": "Push-ups", "sets": 3, "reps": "12", "rest_seconds": 60, "instructions": "Keep core tight"},
+        {"name": "Bodyweight Squats", "sets": 3, "reps": "15", "rest_seconds": 60},
+        {"name": "Lunges", "sets": 3, "reps": "10", "rest_seconds": 60},
+        {"name": "Pull-ups", "sets": 3, "reps": "6-8", "rest_seconds": 90},
+        {"name": "Burpees", "sets": 2, "reps": "10", "rest_seconds": 45},
+        {"name": "Mountain Climbers", "sets": 2, "reps": "30 seconds", "rest_seconds": 30},
+    ]},
+    "aliases_and_typos": {"exercises": [
+        {"name": "Press Ups", "sets": 3, "reps": 12, "rest_seconds": 60},
+        {"name": "Air Squats", "sets": "3", "reps": "15"},
+        {"name": "Walking Lunges", "sets": 3, "reps": "10"},
+        {"name": "Pullups", "sets": 3, "reps": "6-8", "rest_seconds": 90},
+        {"name": "Burpes", "sets": 2, "reps": "10"},
+        {"name": "Plank", "sets": 3, "reps": "45 seconds"},
+    ]},
+}
+
+
+def bench(name: str, text: str, iterations: int) -> None:
+    parsed = parse_workout_json(text, [], "advanced", 8)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse_workout_json(text, [], "advanced", 8)
+    per_plan_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{name:<20} {per_plan_us:8.1f} us/plan  mapped={len(parsed.exercises)} failed={parsed.failed}")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, payload in SAMPLE_RESPONSES.items():
+        bench(name, json.dumps(payload), iterations)
+    bench("fenced_markdown", "```json\n" + json.dumps(SAMPLE_RESPONSES["clean"]) + "\n```", iterations)
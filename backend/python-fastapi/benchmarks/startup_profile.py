@@ -0,0 +1,70 @@
+# FitSync AI - Startup import-time profile
+# Usage: python benchmarks/startup_profile.py [top_n] > benchmarks/startup_profile.txt
+# Runs each service's module import under `python -X importtime` in a fresh
+# interpreter and reports the slowest top-level imports.
+
+import os
+import subprocess
+import sys
+import time
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICES = ["main.py", "enhanced-main.py"]
+
+# Executing the file directly keeps its own imports at the top level of the report
+LOADER = (
+    "import importlib.util; "
+    "spec = importlib.util.spec_from_file_location('service', {path!r}); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+# Modules that must never load at import time; they belong to lazy subsystems
+HEAVY_MODULES = ("openai", "sklearn", "sentence_transformers", "torch", "numpy", "scipy", "joblib")
+
+
+def profile(code: str):
+    env = dict(os.environ, FAST_BOOT="1")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SERVICE_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    top_level = []
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        cumulative_us, name = _split(line)
+        loaded.add(name.strip().split(".")[0])
+        # Top-level imports have no leading indentation in the module column
+        if not name.startswith(" "):
+            top_level.append((int(cumulative_us), name.strip()))
+    top_level.sort(reverse=True)
+    return wall, top_level, loaded
+
+
+def _split(line: str):
+    # "import time: self [us] | cumulative | imported package"
+    fields = line[len("import time:"):].split("|")
+    return fields[1].strip(), fields[2][1:]
+
+
+def main(top_n: int) -> None:
+    print(f"Python {sys.version.split()[0]}, FAST_BOOT=1")
+    for service in SERVICES:
+        wall, top_level, loaded = profile(LOADER.format(path=service))
+        total_ms = sum(us for us, _ in top_level) / 1000
+        heavy = sorted(m for m in HEAVY_MODULES if m in loaded)
+        print(f"\n{service}: imports {total_ms:.1f} ms, interpreter wall {wall * 1000:.1f} ms")
+        print(f"  heavy modules loaded at import: {', '.join(heavy) or 'none'}")
+        for cumulative_us, name in top_level[:top_n]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
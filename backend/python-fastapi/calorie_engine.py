@@ -0,0 +1,239 @@
+# FitSync AI - Calorie engine
+# MET table aligned with the exercise catalog and vectorized energy estimates
+
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from exercise_catalog import EXERCISES, lookup_exercise
+
+# Metabolic equivalents while working a set (Compendium of Physical Activities)
+EXERCISE_METS = {
+    "Push-ups": 3.8,
+    "Bench Press": 5.0,
+    "Incline Dumbbell Press": 5.0,
+    "Chest Dips": 5.0,
+    "Bodyweight Squats": 5.0,
+    "Lunges": 4.0,
+    "Deadlifts": 6.0,
+    "Bulgarian Split Squats": 5.0,
+    "Pull-ups": 8.0,
+    "Bent-over Rows": 5.0,
+    "Lat Pulldowns": 3.5,
+    "Jumping Jacks": 7.7,
+    "High Knees": 8.0,
+    "Burpees": 8.0,
+    "Mountain Climbers": 8.0,
+    "Cat-Cow Stretch": 2.3,
+    "Downward Dog": 2.5,
+    "Pigeon Pose": 2.3,
+}
+# Fallbacks for catalog entries without a MET value, and for unknown exercises
+DEFAULT_METS = {"strength": 5.0, "cardio": 8.0, "flexibility": 2.3}
+DEFAULT_MET = 5.0
+# Seconds per repetition by workout type (controlled tempo for strength)
+REP_SECONDS = {"strength": 3.0, "cardio": 1.0, "flexibility": 5.0}
+DEFAULT_REP_SECONDS = 3.0
+# Recovery between sets, and warm-up/transitions filling the rest of a session
+REST_MET = 1.5
+SESSION_MET = 3.0
+DEFAULT_REPS = 10.0
+DEFAULT_WEIGHT_KG = 70.0
+# Ceilings for client- and LLM-supplied values, so float32 math stays finite
+MAX_SETS = 50.0
+MAX_REPS = 500.0
+MAX_TIMED_SECONDS = 3600.0
+MAX_REST_SECONDS = 1800.0
+MAX_WEIGHT_KG = 500.0
+MAX_DURATION_MINUTES = 1440.0
+
+_REPS_RE = re.compile(r"(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(sec|s\b|min)?")
+
+
+def parse_reps(reps: Any) -> Tuple[float, float]:
+    """Rep prescription -> (repetitions, timed seconds); "8-12" is 10 reps, "30 seconds" is 30 s"""
+    if isinstance(reps, (int, float)) and not isinstance(reps, bool):
+        return _number(reps, DEFAULT_REPS, MAX_REPS), 0.0
+    if isinstance(reps, str):
+        return _parse_reps_text(reps)
+    # Lists, dicts and other shapes the LLM or a client may send
+    return DEFAULT_REPS, 0.0
+
+
+def _number(value: Any, default: float, maximum: float) -> float:
+    """Non-negative finite float capped at ``maximum``, or the default for anything else"""
+    if isinstance(value, bool):
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+    if not math.isfinite(number) or number < 0:
+        return default
+    return min(number, maximum)
+
+
+@lru_cache(maxsize=1024)
+def _parse_reps_text(reps: str) -> Tuple[float, float]:
+    match = _REPS_RE.search(reps.lower())
+    if match is None:
+        return DEFAULT_REPS, 0.0
+    low = float(match.group(1))
+    value = (low + float(match.group(2))) / 2 if match.group(2) else low
+    unit = match.group(3)
+    if unit == "min":
+        return 0.0, min(value * 60, MAX_TIMED_SECONDS)
+    if unit:
+        return 0.0, min(value, MAX_TIMED_SECONDS)
+    return min(value, MAX_REPS), 0.0
+
+
+@dataclass
+class ExerciseBatch:
+    """Columnar exercise rows; ``workout`` numbers the workout each row belongs to"""
+
+    index: np.ndarray
+    sets: np.ndarray
+    reps: np.ndarray
+    timed_seconds: np.ndarray
+    rest_seconds: np.ndarray
+    workout: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class CalorieEngine:
+    """Per-exercise energy from MET x body weight x time, one array op per batch.
+
+    ``met`` and ``rep_seconds`` are indexed by position in EXERCISES, with one
+    extra trailing slot for exercises the catalog does not know.
+    """
+
+    def __init__(self, exercises: Sequence[Dict[str, Any]] = EXERCISES, mets: Dict[str, float] = EXERCISE_METS):
+        self.ids = [exercise["id"] for exercise in exercises]
+        self.positions = {exercise_id: i for i, exercise_id in enumerate(self.ids)}
+        self.unknown = len(self.ids)
+        self.met = np.array(
+            [mets.get(ex["name"], DEFAULT_METS.get(ex["workout_type"], DEFAULT_MET)) for ex in exercises] + [DEFAULT_MET],
+            dtype=np.float32,
+        )
+        self.rep_seconds = np.array(
+            [REP_SECONDS.get(ex["workout_type"], DEFAULT_REP_SECONDS) for ex in exercises] + [DEFAULT_REP_SECONDS],
+            dtype=np.float32,
+        )
+
+    def position(self, exercise: Dict[str, Any]) -> int:
+        exercise_id, name = exercise.get("id"), exercise.get("name")
+        index = self.positions.get(exercise_id) if isinstance(exercise_id, str) else None
+        if index is None and name and isinstance(name, str):
+            match = lookup_exercise(name)
+            index = self.positions.get(match["id"]) if match else None
+        return self.unknown if index is None else index
+
+    def _row(self, exercise: Any) -> Tuple[int, float, float, float, float]:
+        """(position, sets, reps, timed seconds, rest seconds); malformed fields fall back to defaults"""
+        if not isinstance(exercise, dict):
+            # Kept as a zero-energy row so per-exercise output stays aligned with the input
+            return self.unknown, 0.0, 0.0, 0.0, 0.0
+        reps, timed_seconds = parse_reps(exercise.get("reps", DEFAULT_REPS))
+        return (
+            self.position(exercise),
+            _number(exercise.get("sets") or 1, 1.0, MAX_SETS),
+            reps,
+            timed_seconds,
+            _number(exercise.get("rest_seconds") or 0, 0.0, MAX_REST_SECONDS),
+        )
+
+    def encode(self, workouts: Sequence[Sequence[Dict[str, Any]]]) -> ExerciseBatch:
+        """Columnar batch from plan exercise dicts (``id`` or ``name``, sets, reps, rest_seconds)"""
+        workout_ids = [w for w, exercises in enumerate(workouts) for _ in exercises]
+        rows = [self._row(exercise) for exercises in workouts for exercise in exercises]
+        columns = np.array(rows, dtype=np.float64).reshape(len(rows), 5)
+        return ExerciseBatch(
+            index=columns[:, 0].astype(np.int32),
+            sets=columns[:, 1].astype(np.float32),
+            reps=columns[:, 2].astype(np.float32),
+            timed_seconds=columns[:, 3].astype(np.float32),
+            rest_seconds=columns[:, 4].astype(np.float32),
+            workout=np.array(workout_ids, dtype=np.int32),
+        )
+
+    def _seconds(self, batch: ExerciseBatch) -> Tuple[np.ndarray, np.ndarray]:
+        work = batch.sets * (batch.reps * self.rep_seconds[batch.index] + batch.timed_seconds)
+        return work, batch.sets * batch.rest_seconds
+
+    def per_exercise(self, batch: ExerciseBatch, weight_kg: Any = DEFAULT_WEIGHT_KG) -> np.ndarray:
+        """kcal per row; ``weight_kg`` is a scalar or one value per row"""
+        work, rest = self._seconds(batch)
+        # ACSM: kcal/min = MET * 3.5 * kg / 200
+        return (self.met[batch.index] * work + REST_MET * rest) * (np.asarray(weight_kg, dtype=np.float32) * (3.5 / 200 / 60))
+
+    def workout_totals(
+        self,
+        batch: ExerciseBatch,
+        weight_kg: Any = DEFAULT_WEIGHT_KG,
+        duration_minutes: Optional[Any] = None,
+        workouts: Optional[int] = None,
+    ) -> np.ndarray:
+        """kcal per workout; session time beyond the exercises counts as warm-up at SESSION_MET.
+
+        ``weight_kg`` and ``duration_minutes`` are scalars or one value per workout.
+        """
+        workouts = workouts if workouts is not None else (int(batch.workout.max()) + 1 if len(batch) else 0)
+        weight = np.broadcast_to(np.asarray(weight_kg, dtype=np.float32), (workouts,))
+        # astype: bincount of an empty batch comes back as integers
+        totals = np.bincount(
+            batch.workout, weights=self.per_exercise(batch, weight[batch.workout]), minlength=workouts
+        ).astype(np.float64)
+        if duration_minutes is not None:
+            work, rest = self._seconds(batch)
+            used = np.bincount(batch.workout, weights=work + rest, minlength=workouts)
+            extra = np.maximum(np.asarray(duration_minutes, dtype=np.float64) * 60 - used, 0.0)
+            totals += SESSION_MET * extra * weight * (3.5 / 200 / 60)
+        return totals
+
+    def estimate(
+        self,
+        exercises: Sequence[Dict[str, Any]],
+        weight_kg: Optional[float] = None,
+        duration_minutes: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Per-exercise and total kcal for one plan"""
+        weight = _number(weight_kg or DEFAULT_WEIGHT_KG, DEFAULT_WEIGHT_KG, MAX_WEIGHT_KG)
+        if duration_minutes is not None:
+            duration_minutes = _number(duration_minutes, 0.0, MAX_DURATION_MINUTES)
+        batch = self.encode([exercises])
+        per_exercise = self.per_exercise(batch, weight)
+        total = self.workout_totals(batch, weight, duration_minutes, workouts=1)[0]
+        return {
+            "total": int(round(total)),
+            "per_exercise": [int(round(kcal)) for kcal in per_exercise],
+        }
+
+    def score_history(
+        self,
+        workouts: Sequence[Sequence[Dict[str, Any]]],
+        weight_kg: Any = DEFAULT_WEIGHT_KG,
+        duration_minutes: Optional[Any] = None,
+    ) -> List[int]:
+        """Re-score a list of completed workouts (exercise dicts) in one pass; missing weights use the default"""
+        if weight_kg is None or np.isscalar(weight_kg):
+            weight_kg = _number(weight_kg or DEFAULT_WEIGHT_KG, DEFAULT_WEIGHT_KG, MAX_WEIGHT_KG)
+        else:
+            weight_kg = [_number(weight or DEFAULT_WEIGHT_KG, DEFAULT_WEIGHT_KG, MAX_WEIGHT_KG) for weight in weight_kg]
+        if duration_minutes is not None:
+            if np.isscalar(duration_minutes):
+                duration_minutes = _number(duration_minutes, 0.0, MAX_DURATION_MINUTES)
+            else:
+                duration_minutes = [_number(minutes, 0.0, MAX_DURATION_MINUTES) for minutes in duration_minutes]
+        batch = self.encode(workouts)
+        totals = self.workout_totals(batch, weight_kg, duration_minutes, workouts=len(workouts))
+        return [int(kcal) for kcal in np.rint(totals)]
+
+
+calorie_engine = CalorieEngine()
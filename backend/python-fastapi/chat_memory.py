@@ -0,0 +1,181 @@
+# FitSync AI - Bounded chat memory
+# Last K turns in a capped Redis list plus a rolling summary of everything older
+
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from prompts import TOKENS_PER_MESSAGE, TOKENS_PER_REPLY, count_tokens
+
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_TURNS = int(os.getenv("CHAT_HISTORY_TURNS", "6"))
+CHAT_PROMPT_BUDGET = int(os.getenv("CHAT_PROMPT_BUDGET", "1500"))
+# Overflow turns are folded into the summary in batches to amortize the LLM call
+FOLD_TURNS = 2
+# Hard cap on stored turns, so memory stays bounded even if summarization is down
+MAX_STORED_TURNS = 4 * CHAT_HISTORY_TURNS
+MEMORY_TTL = 30 * 86400
+SUMMARY_LOCK_TTL = 60
+
+Summarizer = Callable[[str, List[Dict[str, str]]], Awaitable[str]]
+
+# Stores the summary and drops the folded prefix in one step. append() trims the
+# list head concurrently, so the script drops only the folded entries still at the
+# head (the longest suffix of ARGV[3..] that the list starts with).
+# KEYS: history, summary; ARGV: summary entry, ttl, folded entries oldest first
+COMPACT_SCRIPT = """
+local folded = #ARGV - 2
+local head = redis.call('LRANGE', KEYS[1], 0, folded - 1)
+local remaining = 0
+for dropped = 0, folded do
+    local match = true
+    for i = 1, folded - dropped do
+        if head[i] ~= ARGV[2 + dropped + i] then
+            match = false
+            break
+        end
+    end
+    if match then
+        remaining = folded - dropped
+        break
+    end
+end
+if remaining > 0 then
+    redis.call('LTRIM', KEYS[1], remaining, -1)
+end
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+return remaining
+"""
+
+
+def _encode(role: str, content: str, model: str) -> str:
+    # Token counts are computed once at write time, never per prompt assembly
+    return json.dumps({"role": role, "content": content, "tokens": count_tokens(content, model)})
+
+
+class ChatMemory:
+    """Per-user conversation memory with constant-size prompt assembly.
+
+    ``chat_history:{user}`` is a Redis list of messages trimmed to a fixed
+    number of turns; ``chat_summary:{user}`` holds a rolling summary of the
+    turns that fell out of the window. Reads fetch both in one round trip and
+    only ever touch the last ``turns`` turns.
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[Any], Any],
+        turns: int = CHAT_HISTORY_TURNS,
+        prompt_budget: int = CHAT_PROMPT_BUDGET,
+        model: str = "gpt-3.5-turbo",
+    ):
+        self.get_redis = get_redis
+        self.keep_messages = 2 * turns
+        self.max_messages = 2 * max(turns + FOLD_TURNS, MAX_STORED_TURNS)
+        self.prompt_budget = prompt_budget
+        self.model = model
+
+    @staticmethod
+    def _keys(user_id: Any) -> Tuple[str, str, str]:
+        return f"chat_history:{user_id}", f"chat_summary:{user_id}", f"chat_summary_lock:{user_id}"
+
+    async def load(self, user_id: Any) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Rolling summary and the most recent turns, oldest first"""
+        history_key, summary_key, _ = self._keys(user_id)
+        try:
+            pipe = self.get_redis(user_id).pipeline(transaction=False)
+            pipe.get(summary_key)
+            pipe.lrange(history_key, -self.keep_messages, -1)
+            summary, history = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Chat memory unavailable for user {user_id}: {e}")
+            return None, []
+        return (json.loads(summary) if summary else None), [json.loads(entry) for entry in history]
+
+    def build_messages(
+        self,
+        system_prompt: str,
+        summary: Optional[Dict[str, Any]],
+        history: List[Dict[str, Any]],
+        message: str,
+    ) -> Tuple[List[Dict[str, str]], int]:
+        """Assemble the prompt within the token budget, dropping the oldest turns first"""
+        head = [{"role": "system", "content": system_prompt}]
+        used = TOKENS_PER_REPLY + 2 * TOKENS_PER_MESSAGE + count_tokens(system_prompt, self.model)
+        used += count_tokens(message, self.model)
+        if summary:
+            head.append({"role": "system", "content": f"Conversation so far: {summary['content']}"})
+            used += TOKENS_PER_MESSAGE + summary["tokens"] + 4
+
+        recent: List[Dict[str, str]] = []
+        for entry in reversed(history):
+            cost = TOKENS_PER_MESSAGE + entry["tokens"]
+            if used + cost > self.prompt_budget:
+                break
+            used += cost
+            recent.append({"role": entry["role"], "content": entry["content"]})
+        recent.reverse()
+        return head + recent + [{"role": "user", "content": message}], used
+
+    async def append(self, user_id: Any, message: str, response: str) -> bool:
+        """Record one turn; True when enough older turns piled up to fold into the summary"""
+        history_key, summary_key, _ = self._keys(user_id)
+        try:
+            pipe = self.get_redis(user_id).pipeline(transaction=False)
+            pipe.rpush(
+                history_key,
+                _encode("user", message, self.model),
+                _encode("assistant", response, self.model),
+            )
+            pipe.ltrim(history_key, -self.max_messages, -1)
+            pipe.expire(history_key, MEMORY_TTL)
+            pipe.expire(summary_key, MEMORY_TTL)
+            length, *_ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record chat turn for user {user_id}: {e}")
+            return False
+        return int(length) - self.keep_messages >= 2 * FOLD_TURNS
+
+    async def compact(self, user_id: Any, summarize: Summarizer):
+        """Fold turns older than the window into the rolling summary (run off the request path)"""
+        history_key, summary_key, lock_key = self._keys(user_id)
+        client = self.get_redis(user_id)
+        try:
+            if not await client.set(lock_key, "1", nx=True, ex=SUMMARY_LOCK_TTL):
+                return
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.get(summary_key)
+                pipe.llen(history_key)
+                summary, length = await pipe.execute()
+                overflow = int(length) - self.keep_messages
+                if overflow <= 0:
+                    return
+                raw = await client.lrange(history_key, 0, overflow - 1)
+                older = [json.loads(entry) for entry in raw]
+                previous = json.loads(summary)["content"] if summary else ""
+                updated = await summarize(
+                    previous, [{"role": entry["role"], "content": entry["content"]} for entry in older]
+                )
+
+                # Appends may have trimmed the head meanwhile, so the script re-locates the prefix
+                await client.eval(
+                    COMPACT_SCRIPT, 2, history_key, summary_key,
+                    _encode("summary", updated, self.model), MEMORY_TTL, *raw
+                )
+            finally:
+                await client.delete(lock_key)
+        except Exception as e:
+            logger.error(f"Chat summary update failed for user {user_id}: {e}")
+
+
+async def extractive_summary(summary: str, messages: List[Dict[str, str]]) -> str:
+    """LLM-free summarizer: keeps the first sentence of each user message, newest last"""
+    points = [summary] if summary else []
+    for message in messages:
+        if message["role"] == "user":
+            points.append(message["content"].split(". ")[0].strip()[:200])
+    # Bounded like the LLM summary: older points fall off first
+    return " | ".join(points)[-1000:]
@@ -0,0 +1,147 @@
+# FitSync AI - Exercise catalog
+# Shared exercise database with precomputed ID and name lookups
+
+import difflib
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# Enhanced exercise database
+EXERCISE_DATABASE = {
+    "strength": {
+        "chest": [
+            {"name": "Push-ups", "difficulty": "beginner", "equipment": [], "muscle_groups": ["chest", "triceps", "shoulders"]},
+            {"name": "Bench Press", "difficulty": "intermediate", "equipment": ["barbell", "bench"], "muscle_groups": ["chest", "triceps", "shoulders"]},
+            {"name": "Incline Dumbbell Press", "difficulty": "intermediate", "equipment": ["dumbbells", "bench"], "muscle_groups": ["chest", "shoulders"]},
+            {"name": "Chest Dips", "difficulty": "advanced", "equipment": ["dip_bars"], "muscle_groups": ["chest", "triceps"]}
+        ],
+        "legs": [
+            {"name": "Bodyweight Squats", "difficulty": "beginner", "equipment": [], "muscle_groups": ["quadriceps", "glutes"]},
+            {"name": "Lunges", "difficulty": "beginner", "equipment": [], "muscle_groups": ["quadriceps", "glutes", "hamstrings"]},
+            {"name": "Deadlifts", "difficulty": "intermediate", "equipment": ["barbell"], "muscle_groups": ["hamstrings", "glutes", "back"]},
+            {"name": "Bulgarian Split Squats", "difficulty": "advanced", "equipment": [], "muscle_groups": ["quadriceps", "glutes"]}
+        ],
+        "back": [
+            {"name": "Pull-ups", "difficulty": "intermediate", "equipment": ["pull_up_bar"], "muscle_groups": ["back", "biceps"]},
+            {"name": "Bent-over Rows", "difficulty": "intermediate", "equipment": ["barbell"], "muscle_groups": ["back", "biceps"]},
+            {"name": "Lat Pulldowns", "difficulty": "beginner", "equipment": ["cable_machine"], "muscle_groups": ["back", "biceps"]}
+        ]
+    },
+    "cardio": [
+        {"name": "Jumping Jacks", "difficulty": "beginner", "equipment": [], "muscle_groups": ["full_body"]},
+        {"name": "High Knees", "difficulty": "beginner", "equipment": [], "muscle_groups": ["legs", "core"]},
+        {"name": "Burpees", "difficulty": "advanced", "equipment": [], "muscle_groups": ["full_body"]},
+        {"name": "Mountain Climbers", "difficulty": "intermediate", "equipment": [], "muscle_groups": ["core", "shoulders"]}
+    ],
+    "flexibility": [
+        {"name": "Cat-Cow Stretch", "difficulty": "beginner", "equipment": [], "muscle_groups": ["back", "core"]},
+        {"name": "Downward Dog", "difficulty": "beginner", "equipment": [], "muscle_groups": ["hamstrings", "calves", "shoulders"]},
+        {"name": "Pigeon Pose", "difficulty": "intermediate", "equipment": [], "muscle_groups": ["hips", "glutes"]}
+    ]
+}
+
+# Alternative names the LLM commonly uses, keyed by canonical exercise name
+EXERCISE_ALIASES = {
+    "Push-ups": ["push up", "press up", "pushup"],
+    "Bench Press": ["barbell bench press", "flat bench press"],
+    "Incline Dumbbell Press": ["incline press", "incline db press", "incline dumbbell bench press"],
+    "Chest Dips": ["dips", "parallel bar dips"],
+    "Bodyweight Squats": ["squats", "air squats", "bodyweight squat"],
+    "Lunges": ["forward lunges", "walking lunges", "alternating lunges"],
+    "Deadlifts": ["conventional deadlift", "barbell deadlift"],
+    "Bulgarian Split Squats": ["split squats", "rear foot elevated split squat"],
+    "Pull-ups": ["pullup", "pull up"],
+    "Bent-over Rows": ["barbell rows", "bent over barbell row", "barbell bent over row"],
+    "Lat Pulldowns": ["lat pull down", "cable lat pulldown", "wide grip lat pulldown"],
+    "Jumping Jacks": ["star jumps", "jumping jack"],
+    "High Knees": ["high knee run", "running in place"],
+    "Burpees": ["burpee", "full burpees"],
+    "Mountain Climbers": ["mountain climber"],
+    "Cat-Cow Stretch": ["cat cow", "cat camel stretch"],
+    "Downward Dog": ["downward facing dog", "down dog"],
+    "Pigeon Pose": ["pigeon stretch", "half pigeon"],
+}
+
+FUZZY_MATCH_CUTOFF = 0.8
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_exercise_name(name: str) -> str:
+    """Lowercase, strip punctuation and plurals so name variants share one key"""
+    words = _NON_ALNUM_RE.sub(" ", name.lower()).split()
+    return " ".join(
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in words
+    )
+
+
+def _index_key(name: str) -> str:
+    # Word order is ignored so "Barbell Bench Press" and "Bench Press (barbell)" agree
+    return " ".join(sorted(normalize_exercise_name(name).split()))
+
+
+def _flatten_catalog() -> List[Dict[str, Any]]:
+    exercises = []
+    for workout_type, category in EXERCISE_DATABASE.items():
+        groups = category.items() if isinstance(category, dict) else [(workout_type, category)]
+        for group, entries in groups:
+            for exercise in entries:
+                exercises.append({
+                    **exercise,
+                    "id": normalize_exercise_name(exercise["name"]).replace(" ", "_"),
+                    "workout_type": workout_type,
+                    "group": group,
+                })
+    return exercises
+
+
+# Flat catalog; list position is the exercise index used by array-backed tables
+EXERCISES: List[Dict[str, Any]] = _flatten_catalog()
+EXERCISES_BY_ID: Dict[str, Dict[str, Any]] = {ex["id"]: ex for ex in EXERCISES}
+
+# Normalized name/alias -> exercise ID
+EXERCISE_NAME_INDEX: Dict[str, str] = {}
+for _exercise in EXERCISES:
+    EXERCISE_NAME_INDEX[_index_key(_exercise["name"])] = _exercise["id"]
+    for _alias in EXERCISE_ALIASES.get(_exercise["name"], []):
+        EXERCISE_NAME_INDEX.setdefault(_index_key(_alias), _exercise["id"])
+_NAME_KEYS = list(EXERCISE_NAME_INDEX)
+
+
+@lru_cache(maxsize=1024)
+def _fuzzy_lookup(key: str) -> Optional[str]:
+    matches = difflib.get_close_matches(key, _NAME_KEYS, n=1, cutoff=FUZZY_MATCH_CUTOFF)
+    return EXERCISE_NAME_INDEX[matches[0]] if matches else None
+
+
+def lookup_exercise(name: str) -> Optional[Dict[str, Any]]:
+    """Map a free-text exercise name to a catalog entry (exact/alias first, then fuzzy)"""
+    key = _index_key(name)
+    exercise_id = EXERCISE_NAME_INDEX.get(key) or _fuzzy_lookup(key)
+    return EXERCISES_BY_ID.get(exercise_id) if exercise_id else None
+
+
+def exercises_for_workout(workout_type: str, muscle_groups: List[str]) -> List[Dict[str, Any]]:
+    """Candidate catalog exercises for a workout type and target muscle groups"""
+    if workout_type == "strength":
+        groups = muscle_groups or ["chest", "legs", "back"]
+        return [ex for ex in EXERCISES if ex["workout_type"] == "strength" and ex["group"] in groups]
+    if workout_type in ("cardio", "flexibility"):
+        return [ex for ex in EXERCISES if ex["workout_type"] == workout_type]
+    return list(EXERCISES)  # mixed
+
+
+def is_exercise_allowed(exercise: Dict[str, Any], equipment: List[str], experience_level: str) -> bool:
+    """Check an exercise against the available equipment and experience level"""
+    has_equipment = (
+        not equipment or
+        not exercise["equipment"] or
+        any(eq in equipment for eq in exercise["equipment"])
+    )
+    right_level = (
+        exercise["difficulty"] == experience_level or
+        (experience_level == "intermediate" and exercise["difficulty"] in ["beginner", "intermediate"]) or
+        experience_level == "advanced"
+    )
+    return has_equipment and right_level
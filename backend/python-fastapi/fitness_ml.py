@@ -0,0 +1,109 @@
+# FitSync AI - FitnessML serving models
+# Loaded in the background by the API services (see warmup.py)
+
+import logging
+from typing import Any, Dict
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from model_registry import HotModel, ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+WORKOUT_MODEL_NAME = "fitness_workout"
+
+# Feature order shared by training and serving
+FEATURES = ["age", "weight", "height", "activity_level_numeric", "fitness_experience"]
+FEATURE_DEFAULTS = np.array([25.0, 70.0, 170.0, 3.0, 1.0], dtype=np.float32)
+TARGETS = ["recommended_intensity", "optimal_duration"]
+
+ACTIVITY_LEVELS = {
+    "SEDENTARY": 1.0,
+    "LIGHTLY_ACTIVE": 2.0,
+    "MODERATELY_ACTIVE": 3.0,
+    "VERY_ACTIVE": 4.0,
+    "EXTRA_ACTIVE": 5.0,
+}
+
+
+def serving_features(user_data: Dict[str, Any]) -> np.ndarray:
+    """Feature row for one user profile (values may arrive as strings from Redis)"""
+    row = FEATURE_DEFAULTS.copy()
+    for i, name in enumerate(FEATURES):
+        value = user_data.get(name)
+        if name == "activity_level_numeric" and value is None:
+            value = ACTIVITY_LEVELS.get(str(user_data.get("activity_level", "")).upper())
+        try:
+            row[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return row.reshape(1, -1)
+
+
+def profile_number(user_data: Dict[str, Any], name: str, default: float) -> float:
+    """Numeric profile field (Redis returns strings), falling back to the default"""
+    try:
+        return float(user_data.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class FitnessML:
+    def __init__(self):
+        self.workout_model = HotModel(ModelRegistry(WORKOUT_MODEL_NAME))
+        self.nutrition_model = RandomForestRegressor(n_estimators=100)
+        self.load_models()
+    
+    def load_models(self):
+        # Trained offline by fitness_training.py; newer versions are picked up while serving
+        logger.info("Loading ML models...")
+        self.workout_model.refresh()
+        if self.workout_model.model is None:
+            logger.warning("No trained workout model published yet, using heuristic predictions")
+        
+    async def predict_optimal_workout(self, user_data: dict) -> dict:
+        """Predict optimal workout parameters based on user data and progress"""
+        # Feature engineering
+        features = serving_features(user_data)
+        
+        model = self.workout_model.get()
+        if model is not None:
+            predicted_intensity, predicted_duration = model.predict(features)[0]
+            predicted_intensity = float(np.clip(predicted_intensity, 0.4, 1.0))
+            predicted_duration = int(predicted_duration)
+        else:
+            # Mock prediction until a trained model is published
+            predicted_intensity = np.random.uniform(0.6, 0.9)
+            predicted_duration = int(np.random.uniform(30, 90))
+        
+        return {
+            "recommended_intensity": predicted_intensity,
+            "optimal_duration": predicted_duration,
+            "recovery_time": int(24 + (1 - predicted_intensity) * 24),
+            "model_version": self.workout_model.version
+        }
+    
+    async def predict_nutrition_needs(self, user_data: dict) -> dict:
+        """Predict nutritional needs based on goals and activity"""
+        bmr = self.calculate_bmr(user_data)
+        tdee = bmr * profile_number(user_data, 'activity_multiplier', 1.4)
+        
+        return {
+            "daily_calories": int(tdee),
+            "protein_grams": int(profile_number(user_data, 'weight', 70) * 2.2),
+            "carb_grams": int(tdee * 0.45 / 4),
+            "fat_grams": int(tdee * 0.25 / 9)
+        }
+    
+    def calculate_bmr(self, user_data: dict) -> float:
+        """Calculate Basal Metabolic Rate"""
+        weight = profile_number(user_data, 'weight', 70)
+        height = profile_number(user_data, 'height', 170)
+        age = profile_number(user_data, 'age', 25)
+        gender = str(user_data.get('gender') or 'male')
+        
+        if gender.lower() == 'male':
+            return 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+        else:
+            return 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
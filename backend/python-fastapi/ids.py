@@ -0,0 +1,131 @@
+# FitSync AI - Unique ID generation
+# Time-ordered 64-bit IDs (Snowflake layout) with a sortable 13-character text form
+
+import hashlib
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+# 41 bits of milliseconds since ID_EPOCH (good until 2093), 10 bits of worker, 12 of sequence
+ID_EPOCH_MS = 1704067200000  # 2024-01-01 UTC
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+# Crockford base32: no I, L, O or U; fixed width so text order equals numeric order
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: value for value, char in enumerate(_ALPHABET)}
+ENCODED_LENGTH = 13
+
+
+def _default_worker_id() -> int:
+    """WORKER_ID, unique per process across the deployment; required in production"""
+    configured = os.getenv("WORKER_ID")
+    if configured is not None:
+        worker_id = int(configured)
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"WORKER_ID must be between 0 and {MAX_WORKER_ID}")
+        return worker_id
+    if os.getenv("NODE_ENV") == "production":
+        # A hash of host and pid collides too often (10 bits) once there are a few processes
+        raise RuntimeError("WORKER_ID must be set per process in production (supervisor.py assigns one per worker)")
+    # Development runs a single process, where any worker ID is unique
+    digest = hashlib.blake2b(f"{socket.gethostname()}:{os.getpid()}".encode(), digest_size=2).digest()
+    return int.from_bytes(digest, "big") & MAX_WORKER_ID
+
+
+class IdGenerator:
+    """Monotonic per-process ID source.
+
+    IDs never repeat or go backwards within a worker: a clock that steps
+    back keeps counting from the last timestamp, and a sequence that fills
+    up within one millisecond borrows the next one.
+    """
+
+    def __init__(self, worker_id: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+        # Resolved on first use, so processes that never mint (the supervisor) need no WORKER_ID
+        self.worker_id = worker_id
+
+    def reset(self, worker_id: Optional[int] = None):
+        """Re-derive the worker ID (forked children must not share their parent's)"""
+        with self._lock:
+            self.worker_id = worker_id
+            self._last_ms = 0
+            self._sequence = 0
+
+    def ensure_worker_id(self) -> int:
+        """Resolve the worker ID now (at startup) so a misconfigured process fails before serving"""
+        with self._lock:
+            if self.worker_id is None:
+                self.worker_id = _default_worker_id()
+            return self.worker_id
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self.worker_id is None:
+                self.worker_id = _default_worker_id()
+            now = time.time_ns() // 1_000_000 - ID_EPOCH_MS
+            if now > self._last_ms:
+                self._last_ms = now
+                self._sequence = 0
+            else:
+                self._sequence = (self._sequence + 1) & SEQUENCE_MASK
+                if self._sequence == 0:
+                    self._last_ms += 1
+            return (self._last_ms << TIMESTAMP_SHIFT) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+
+def encode_id(value: int) -> str:
+    chars = []
+    for _ in range(ENCODED_LENGTH):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode_id(text: str) -> int:
+    """Inverse of encode_id; ValueError for anything encode_id could not have produced"""
+    if len(text) != ENCODED_LENGTH:
+        raise ValueError(f"Invalid ID: {text!r}")
+    value = 0
+    for char in text.upper():
+        if char not in _DECODE:
+            raise ValueError(f"Invalid ID: {text!r}")
+        value = (value << 5) | _DECODE[char]
+    if value >> 63:
+        raise ValueError(f"Invalid ID: {text!r}")
+    return value
+
+
+def id_datetime(value: int) -> datetime:
+    return datetime.fromtimestamp(((value >> TIMESTAMP_SHIFT) + ID_EPOCH_MS) / 1000, tz=timezone.utc)
+
+
+def id_from_key(key: str) -> Optional[int]:
+    """Numeric ID from a prefixed key such as ``workout_42_0CK7...``; None for legacy keys"""
+    try:
+        return decode_id(key.rsplit("_", 1)[-1])
+    except ValueError:
+        return None
+
+
+generator = IdGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=generator.reset)
+
+
+def new_id() -> int:
+    return generator.next_id()
+
+
+def new_key(prefix: str) -> str:
+    """Prefixed, time-sortable key: ``new_key("workout_42")`` -> ``workout_42_0CK7W3R5T8G00``"""
+    return f"{prefix}_{encode_id(generator.next_id())}"
@@ -0,0 +1,75 @@
+# FitSync AI - Graceful shutdown
+# Draining state, tracked off-request work and shutdown hooks shared by both services
+
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List, Set
+
+logger = logging.getLogger(__name__)
+
+# Budget for in-flight requests plus tracked work once a worker is told to stop
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", "20"))
+
+# WebSocket close codes: 1012 service restart (reconnect now), 1013 try again later
+WS_CLOSE_RESTART = 1012
+WS_CLOSE_TRY_AGAIN = 1013
+
+
+class Lifecycle:
+    """Tracks a worker's draining state and the work it must finish before exiting.
+
+    ``begin_drain`` flips readiness off and runs the drain hooks (closing
+    WebSockets, for example) once; ``drain`` then waits for tracked tasks
+    until the deadline and cancels whatever is left.
+    """
+
+    def __init__(self, timeout: float = DRAIN_TIMEOUT):
+        self.timeout = timeout
+        self.draining = False
+        self._deadline = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._hooks: List[Callable[[], Awaitable[None]]] = []
+
+    def on_drain(self, hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+        self._hooks.append(hook)
+        return hook
+
+    def spawn(self, coro: Awaitable) -> asyncio.Task:
+        """Run work off the request path; shutdown waits for it"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def remaining(self) -> float:
+        return max(self._deadline - time.monotonic(), 0.0) if self._deadline else self.timeout
+
+    async def begin_drain(self):
+        if self.draining:
+            return
+        self.draining = True
+        self._deadline = time.monotonic() + self.timeout
+        logger.info(f"Draining: {self.pending} pending tasks, {len(self._hooks)} hooks")
+        results = await asyncio.gather(*(hook() for hook in self._hooks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Drain hook failed: {result}")
+
+    async def drain(self):
+        """Wait for tracked work within the remaining budget, then cancel the rest"""
+        await self.begin_drain()
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks), timeout=self.remaining())
+        if pending:
+            logger.error(f"Drain deadline exceeded, cancelling {len(pending)} tasks")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info(f"Drained {len(done)} tasks")
@@ -0,0 +1,141 @@
+# FitSync AI - Model artifact registry
+# Versioned model files plus a manifest that serving workers poll
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.getenv("MODEL_DIR", "models")
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL", "30"))
+KEEP_VERSIONS = 3
+
+
+class ModelRegistry:
+    """Publishes and loads versioned artifacts for one model name.
+
+    Artifacts are written to ``{name}-v{version}.joblib`` and the manifest
+    ``{name}.json`` is replaced atomically last, so readers only ever see
+    complete versions.
+    """
+
+    def __init__(self, name: str, model_dir: str = MODEL_DIR):
+        self.name = name
+        self.model_dir = model_dir
+        self.manifest_path = os.path.join(model_dir, f"{name}.json")
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable manifest {self.manifest_path}: {e}")
+            return None
+
+    def load(self, manifest: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
+        """Load the artifact named by the manifest (latest when not given)"""
+        manifest = manifest or self.read_manifest()
+        if manifest is None:
+            return None, None
+        path = os.path.join(self.model_dir, manifest["artifact"])
+        return joblib.load(path), manifest
+
+    def publish(self, model: Any, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a new artifact version and point the manifest at it"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        previous = self.read_manifest()
+        version = (previous["version"] + 1) if previous else 1
+        artifact = f"{self.name}-v{version}.joblib"
+
+        tmp_path = os.path.join(self.model_dir, f".{artifact}.tmp")
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, os.path.join(self.model_dir, artifact))
+
+        manifest = {
+            **metadata,
+            "name": self.name,
+            "version": version,
+            "artifact": artifact,
+            "published_at": datetime.utcnow().isoformat(),
+        }
+        tmp_manifest = f"{self.manifest_path}.tmp"
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, default=str)
+        os.replace(tmp_manifest, self.manifest_path)
+
+        self._prune(version)
+        logger.info(f"Published {self.name} v{version}")
+        return manifest
+
+    def _prune(self, current_version: int):
+        # Keep a few old versions so workers mid-reload never lose their file
+        for version in range(1, current_version - KEEP_VERSIONS + 1):
+            path = os.path.join(self.model_dir, f"{self.name}-v{version}.joblib")
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class HotModel:
+    """Serving-side handle that swaps in newly published versions without a restart.
+
+    ``get`` never blocks the event loop: once the check interval has passed it
+    starts a refresh in a worker thread and keeps serving the current version
+    until the new one has loaded.
+    """
+
+    def __init__(self, registry: ModelRegistry, check_interval: float = MODEL_CHECK_INTERVAL):
+        self.registry = registry
+        self.check_interval = check_interval
+        # (model, manifest), replaced as one reference so readers never see a mixed pair
+        self._current: Tuple[Optional[Any], Optional[Dict[str, Any]]] = (None, None)
+        self._last_check = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+
+    @property
+    def model(self) -> Optional[Any]:
+        return self._current[0]
+
+    @property
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        return self._current[1]
+
+    @property
+    def version(self) -> Optional[int]:
+        manifest = self.manifest
+        return manifest["version"] if manifest else None
+
+    def get(self) -> Optional[Any]:
+        """Current model; starts a background reload when the check interval has passed"""
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self._last_check = time.monotonic()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Not on an event loop (scripts, warm-up threads): reloading inline blocks no one
+                self.refresh()
+            else:
+                if self._refreshing is None or self._refreshing.done():
+                    self._refreshing = loop.create_task(asyncio.to_thread(self.refresh))
+        return self.model
+
+    def refresh(self):
+        """Load the manifest's version if it is new (blocking; run off the event loop)"""
+        self._last_check = time.monotonic()
+        manifest = self.registry.read_manifest()
+        current = self.manifest
+        if manifest is None or (current and manifest["version"] == current["version"]):
+            return
+        try:
+            self._current = self.registry.load(manifest)
+            logger.info(f"Loaded {self.registry.name} v{self.version}")
+        except Exception as e:
+            logger.error(f"Failed to load {self.registry.name} v{manifest.get('version')}: {e}")
@@ -0,0 +1,412 @@
+# FitSync AI - Nutrition engine
+# Columnar food table and vectorized meal-plan optimizer
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import lsq_linear
+except ImportError:  # Fall back to clipped least squares
+    lsq_linear = None
+
+logger = logging.getLogger(__name__)
+
+# Dietary tags, one bit each in FoodTable.diet_mask
+DIET_TAGS = [
+    "vegetarian", "vegan", "pescatarian", "gluten_free",
+    "dairy_free", "nut_free", "soy_free", "egg_free", "halal",
+]
+DIET_BITS = {tag: 1 << i for i, tag in enumerate(DIET_TAGS)}
+
+# Restriction spellings users send -> required diet tag
+RESTRICTION_ALIASES = {
+    "vegetarian": "vegetarian",
+    "vegan": "vegan",
+    "pescatarian": "pescatarian",
+    "gluten_free": "gluten_free",
+    "celiac": "gluten_free",
+    "dairy_free": "dairy_free",
+    "lactose_intolerant": "dairy_free",
+    "nut_free": "nut_free",
+    "nut_allergy": "nut_free",
+    "soy_free": "soy_free",
+    "egg_free": "egg_free",
+    "halal": "halal",
+}
+
+# Meal slots, one bit each in FoodTable.meal_mask
+MEAL_BITS = {"B": 1, "L": 2, "D": 4, "S": 8}
+
+# Meal names and calorie shares per meal_count
+MEAL_LAYOUTS = {
+    3: [("Breakfast", "B", 0.30), ("Lunch", "L", 0.35), ("Dinner", "D", 0.35)],
+    4: [("Breakfast", "B", 0.25), ("Lunch", "L", 0.35), ("Dinner", "D", 0.30), ("Snack", "S", 0.10)],
+    5: [("Breakfast", "B", 0.25), ("Morning Snack", "S", 0.10), ("Lunch", "L", 0.30),
+        ("Afternoon Snack", "S", 0.10), ("Dinner", "D", 0.25)],
+    6: [("Breakfast", "B", 0.20), ("Morning Snack", "S", 0.10), ("Lunch", "L", 0.25),
+        ("Afternoon Snack", "S", 0.10), ("Dinner", "D", 0.25), ("Evening Snack", "S", 0.10)],
+}
+
+# Default macro split (share of calories) and overrides by health goal
+DEFAULT_MACRO_SPLIT = {"protein": 0.25, "carbs": 0.45, "fat": 0.30}
+GOAL_MACRO_SPLITS = {
+    "muscle_gain": {"protein": 0.30, "carbs": 0.45, "fat": 0.25},
+    "weight_loss": {"protein": 0.35, "carbs": 0.35, "fat": 0.30},
+    "endurance": {"protein": 0.20, "carbs": 0.55, "fat": 0.25},
+    "low_carb": {"protein": 0.30, "carbs": 0.20, "fat": 0.50},
+}
+
+MIN_SERVINGS = 0.25
+MAX_SERVINGS = 4.0
+SERVING_STEP = 0.25
+PREFERENCE_BONUS = 0.15
+REPEAT_PENALTY = 0.3
+# Distinct restriction sets whose allowed-food masks each table keeps
+MAX_ALLOWED_MASKS = 256
+
+_V, _VG, _P, _GF, _DF, _NF, _SF, _EF, _H = DIET_TAGS
+_PLANT = {_V, _VG, _P, _GF, _DF, _NF, _SF, _EF, _H}
+
+# name, serving, kcal, protein g, carbs g, fat g, diet tags, meals, extra tags
+FOOD_DATABASE: List[Tuple[str, str, float, float, float, float, set, str, set]] = [
+    ("Chicken Breast", "100 g", 165, 31.0, 0.0, 3.6, {_GF, _DF, _NF, _SF, _EF, _H}, "LD", {"poultry", "lean"}),
+    ("Turkey Breast", "100 g", 135, 30.0, 0.0, 1.0, {_GF, _DF, _NF, _SF, _EF, _H}, "LD", {"poultry", "lean"}),
+    ("Lean Beef", "100 g", 217, 26.0, 0.0, 12.0, {_GF, _DF, _NF, _SF, _EF, _H}, "LD", {"red_meat"}),
+    ("Salmon", "100 g", 208, 20.0, 0.0, 13.0, {_P, _GF, _DF, _NF, _SF, _EF, _H}, "LD", {"fish", "omega3"}),
+    ("Tuna", "100 g", 132, 28.0, 0.0, 1.3, {_P, _GF, _DF, _NF, _SF, _EF, _H}, "LDS", {"fish", "lean"}),
+    ("Shrimp", "100 g", 99, 24.0, 0.2, 0.3, {_P, _GF, _DF, _NF, _SF, _EF, _H}, "LD", {"seafood", "lean"}),
+    ("Eggs", "2 large", 143, 12.6, 0.7, 9.5, {_V, _P, _GF, _DF, _NF, _SF, _H}, "BLS", {"breakfast"}),
+    ("Egg Whites", "150 g", 78, 16.4, 1.1, 0.3, {_V, _P, _GF, _DF, _NF, _SF, _H}, "B", {"lean"}),
+    ("Greek Yogurt", "170 g", 100, 17.0, 6.0, 0.7, {_V, _P, _GF, _NF, _SF, _EF, _H}, "BS", {"dairy"}),
+    ("Cottage Cheese", "113 g", 90, 12.0, 5.0, 2.5, {_V, _P, _GF, _NF, _SF, _EF, _H}, "BS", {"dairy"}),
+    ("Whey Protein", "1 scoop", 120, 24.0, 3.0, 1.5, {_V, _P, _GF, _NF, _SF, _EF, _H}, "BS", {"supplement"}),
+    ("Pea Protein", "1 scoop", 110, 21.0, 2.0, 2.0, _PLANT - {_SF}, "BS", {"supplement", "plant_protein"}),
+    ("Tofu", "150 g", 144, 15.0, 3.0, 8.7, _PLANT - {_SF}, "LD", {"plant_protein", "asian"}),
+    ("Tempeh", "100 g", 192, 20.0, 7.6, 11.0, _PLANT - {_SF}, "LD", {"plant_protein"}),
+    ("Lentils", "1 cup cooked", 230, 18.0, 40.0, 0.8, _PLANT, "LD", {"legume", "high_fiber"}),
+    ("Chickpeas", "1 cup cooked", 269, 14.5, 45.0, 4.2, _PLANT, "LD", {"legume", "mediterranean"}),
+    ("Black Beans", "1 cup cooked", 227, 15.2, 40.8, 0.9, _PLANT, "LD", {"legume", "mexican"}),
+    ("Edamame", "1 cup", 188, 18.5, 13.8, 8.1, _PLANT - {_SF}, "LS", {"plant_protein", "asian"}),
+    ("Oatmeal", "1 cup cooked", 154, 5.4, 27.0, 2.6, _PLANT - {_GF}, "B", {"whole_grain", "high_fiber"}),
+    ("Whole Wheat Toast", "2 slices", 160, 8.0, 28.0, 2.0, _PLANT - {_GF}, "BS", {"whole_grain"}),
+    ("Brown Rice", "1 cup cooked", 216, 5.0, 45.0, 1.8, _PLANT, "LD", {"whole_grain"}),
+    ("White Rice", "1 cup cooked", 205, 4.3, 45.0, 0.4, _PLANT, "LD", {"asian"}),
+    ("Quinoa", "1 cup cooked", 222, 8.1, 39.0, 3.6, _PLANT, "LD", {"whole_grain"}),
+    ("Whole Wheat Pasta", "1 cup cooked", 174, 7.5, 37.0, 0.8, _PLANT - {_GF}, "LD", {"italian"}),
+    ("Sweet Potato", "1 medium", 112, 2.0, 26.0, 0.1, _PLANT, "LD", {"starchy_vegetable"}),
+    ("Potato", "1 medium", 161, 4.3, 37.0, 0.2, _PLANT, "LD", {"starchy_vegetable"}),
+    ("Whole Wheat Tortilla", "1 large", 140, 4.0, 24.0, 3.5, _PLANT - {_GF}, "L", {"mexican"}),
+    ("Banana", "1 medium", 105, 1.3, 27.0, 0.4, _PLANT, "BS", {"fruit", "produce"}),
+    ("Apple", "1 medium", 95, 0.5, 25.0, 0.3, _PLANT, "S", {"fruit", "produce"}),
+    ("Blueberries", "1 cup", 84, 1.1, 21.0, 0.5, _PLANT, "BS", {"fruit", "produce"}),
+    ("Orange", "1 medium", 62, 1.2, 15.4, 0.2, _PLANT, "S", {"fruit", "produce"}),
+    ("Broccoli", "1 cup", 55, 3.7, 11.2, 0.6, _PLANT, "LD", {"vegetable", "produce"}),
+    ("Spinach", "2 cups raw", 14, 1.7, 2.2, 0.2, _PLANT, "BLD", {"vegetable", "produce"}),
+    ("Mixed Salad Greens", "2 cups", 18, 1.5, 3.4, 0.2, _PLANT, "LD", {"vegetable", "produce"}),
+    ("Bell Peppers", "1 cup", 30, 1.0, 7.0, 0.3, _PLANT, "LD", {"vegetable", "produce"}),
+    ("Green Beans", "1 cup", 44, 2.4, 10.0, 0.4, _PLANT, "D", {"vegetable", "produce"}),
+    ("Asparagus", "1 cup", 27, 2.9, 5.2, 0.2, _PLANT, "D", {"vegetable", "produce"}),
+    ("Avocado", "1/2 fruit", 160, 2.0, 8.5, 14.7, _PLANT, "BLS", {"healthy_fat", "mexican"}),
+    ("Olive Oil", "1 tbsp", 119, 0.0, 0.0, 13.5, _PLANT, "LD", {"healthy_fat", "mediterranean"}),
+    ("Almonds", "28 g", 164, 6.0, 6.1, 14.2, _PLANT - {_NF}, "BS", {"nuts", "healthy_fat"}),
+    ("Peanut Butter", "2 tbsp", 188, 8.0, 6.0, 16.0, _PLANT - {_NF}, "BS", {"nuts", "healthy_fat"}),
+    ("Walnuts", "28 g", 185, 4.3, 3.9, 18.5, _PLANT - {_NF}, "BS", {"nuts", "omega3"}),
+    ("Chia Seeds", "2 tbsp", 138, 4.7, 12.0, 8.7, _PLANT, "BS", {"seeds", "omega3"}),
+    ("Pumpkin Seeds", "28 g", 151, 7.0, 5.0, 13.0, _PLANT, "S", {"seeds"}),
+    ("Hummus", "1/4 cup", 102, 4.9, 8.6, 5.9, _PLANT, "LS", {"legume", "mediterranean"}),
+    ("Cheddar Cheese", "28 g", 113, 7.0, 0.4, 9.3, {_V, _P, _GF, _NF, _SF, _EF, _H}, "LS", {"dairy"}),
+    ("Milk", "1 cup", 122, 8.1, 11.7, 4.8, {_V, _P, _GF, _NF, _SF, _EF, _H}, "BS", {"dairy"}),
+    ("Almond Milk", "1 cup", 39, 1.0, 3.4, 2.5, _PLANT - {_NF}, "BS", {"dairy_alternative"}),
+    ("Rice Cakes", "2 cakes", 70, 1.4, 14.6, 0.6, _PLANT, "S", {"whole_grain"}),
+]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower().replace("-", "_"))
+
+
+class FoodTable:
+    """Column-oriented food catalog with precomputed diet and preference indexes"""
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        servings: Sequence[str],
+        kcal: np.ndarray,
+        protein: np.ndarray,
+        carbs: np.ndarray,
+        fat: np.ndarray,
+        diet_mask: np.ndarray,
+        meal_mask: np.ndarray,
+        tags: Sequence[Iterable[str]],
+    ):
+        self.names = list(names)
+        self.servings = list(servings)
+        self.kcal = np.asarray(kcal, dtype=np.float64)
+        self.protein = np.asarray(protein, dtype=np.float64)
+        self.carbs = np.asarray(carbs, dtype=np.float64)
+        self.fat = np.asarray(fat, dtype=np.float64)
+        self.diet_mask = np.asarray(diet_mask, dtype=np.uint32)
+        self.meal_mask = np.asarray(meal_mask, dtype=np.uint8)
+
+        # Nutrient matrix (rows: kcal, protein, carbs, fat) for the optimizer
+        self.nutrients = np.vstack([self.kcal, self.protein, self.carbs, self.fat])
+
+        # Share of each food's calories from each macro
+        energy = np.maximum(self.kcal, 1.0)
+        self.protein_density = self.protein * 4 / energy
+        self.carb_density = self.carbs * 4 / energy
+        self.fat_density = self.fat * 9 / energy
+
+        # Preference index: tag or name token -> food indices
+        self.preference_index: Dict[str, np.ndarray] = {}
+        buckets: Dict[str, List[int]] = {}
+        for i, (name, food_tags) in enumerate(zip(self.names, tags)):
+            for key in set(_tokens(name)) | set(food_tags):
+                buckets.setdefault(key, []).append(i)
+        for key, indices in buckets.items():
+            self.preference_index[key] = np.asarray(indices, dtype=np.int64)
+
+        self.is_produce = np.zeros(len(self), dtype=bool)
+        if "produce" in self.preference_index:
+            self.is_produce[self.preference_index["produce"]] = True
+
+        # Restriction set -> allowed mask; per table, so dropping a table frees its masks
+        self._allowed_masks: Dict[FrozenSet[str], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Tuple]) -> "FoodTable":
+        names, servings, kcal, protein, carbs, fat, diet_tags, meals, tags = zip(*records)
+        diet_mask = [sum(DIET_BITS[tag] for tag in food_tags) for food_tags in diet_tags]
+        meal_mask = [sum(MEAL_BITS[m] for m in food_meals) for food_meals in meals]
+        return cls(names, servings, np.array(kcal), np.array(protein), np.array(carbs),
+                   np.array(fat), np.array(diet_mask), np.array(meal_mask), tags)
+
+    def allowed(self, restrictions: FrozenSet[str]) -> np.ndarray:
+        """Boolean mask of foods compatible with every dietary restriction"""
+        mask = self._allowed_masks.get(restrictions)
+        if mask is None:
+            if len(self._allowed_masks) >= MAX_ALLOWED_MASKS:
+                # Oldest first; restriction sets come from requests, so the cache stays bounded
+                del self._allowed_masks[next(iter(self._allowed_masks))]
+            mask = self._allowed_masks[restrictions] = self._allowed(restrictions)
+        return mask
+
+    def _allowed(self, restrictions: FrozenSet[str]) -> np.ndarray:
+        required = 0
+        for restriction in restrictions:
+            tag = RESTRICTION_ALIASES.get(restriction.lower().replace("-", "_").replace(" ", "_"))
+            if tag is None:
+                logger.warning(f"Unknown dietary restriction ignored: {restriction}")
+                continue
+            required |= DIET_BITS[tag]
+        mask = (self.diet_mask & required) == required
+        mask.flags.writeable = False
+        return mask
+
+    def preference_scores(self, preferences: Iterable[str]) -> np.ndarray:
+        """Per-food bonus for foods matching any preference tag or name word"""
+        scores = np.zeros(len(self))
+        for preference in preferences:
+            for key in {preference.lower().replace(" ", "_")} | set(_tokens(preference)):
+                indices = self.preference_index.get(key)
+                if indices is not None:
+                    scores[indices] = PREFERENCE_BONUS
+        return scores
+
+
+@dataclass
+class MealTarget:
+    name: str
+    slot: str
+    kcal: float
+    protein: float
+    carbs: float
+    fat: float
+
+    @property
+    def vector(self) -> np.ndarray:
+        return np.array([self.kcal, self.protein, self.carbs, self.fat])
+
+
+def macro_split_for_goals(health_goals: Iterable[str]) -> Dict[str, float]:
+    """Calorie share per macro for the first recognised health goal"""
+    for goal in health_goals:
+        split = GOAL_MACRO_SPLITS.get(goal.lower().replace(" ", "_"))
+        if split:
+            return split
+    return DEFAULT_MACRO_SPLIT
+
+
+def macro_grams(daily_calories: float, split: Dict[str, float]) -> Dict[str, float]:
+    return {
+        "protein": daily_calories * split["protein"] / 4,
+        "carbs": daily_calories * split["carbs"] / 4,
+        "fat": daily_calories * split["fat"] / 9,
+    }
+
+
+def _solve_servings(nutrients: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Bounded least squares on relative error; calories weighted double"""
+    weights = 1.0 / np.maximum(target, 1.0)
+    weights[0] *= 2.0
+    a = nutrients * weights[:, None]
+    b = target * weights
+    if lsq_linear is not None:
+        x = lsq_linear(a, b, bounds=(MIN_SERVINGS, MAX_SERVINGS)).x
+    else:
+        # Small active-set loop: pin variables that hit a bound and re-solve the rest
+        x = np.full(a.shape[1], MIN_SERVINGS)
+        free = np.ones(a.shape[1], dtype=bool)
+        for _ in range(a.shape[1]):
+            residual = b - a[:, ~free] @ x[~free]
+            x[free] = np.linalg.lstsq(a[:, free], residual, rcond=None)[0]
+            clipped = free & ((x < MIN_SERVINGS) | (x > MAX_SERVINGS))
+            x = np.clip(x, MIN_SERVINGS, MAX_SERVINGS)
+            if not clipped.any():
+                break
+            free &= ~clipped
+            if not free.any():
+                break
+    return np.clip(np.round(x / SERVING_STEP) * SERVING_STEP, MIN_SERVINGS, MAX_SERVINGS)
+
+
+class NutritionEngine:
+    """Builds daily meal plans from a FoodTable"""
+
+    def __init__(self, table: FoodTable):
+        self.table = table
+
+    def meal_targets(
+        self,
+        daily_calories: float,
+        protein: float,
+        carbs: float,
+        fat: float,
+        meal_count: int,
+    ) -> List[MealTarget]:
+        layout = MEAL_LAYOUTS[min(max(meal_count, 3), 6)]
+        return [
+            MealTarget(name, slot, daily_calories * share, protein * share, carbs * share, fat * share)
+            for name, slot, share in layout
+        ]
+
+    def _pick(self, score: np.ndarray, candidates: np.ndarray, chosen: List[int]) -> Optional[int]:
+        score = np.where(candidates, score, -np.inf)
+        if chosen:
+            score[chosen] = -np.inf
+        best = int(np.argmax(score))
+        return best if np.isfinite(score[best]) else None
+
+    def _compose_meal(
+        self,
+        target: MealTarget,
+        allowed: np.ndarray,
+        bonus: np.ndarray,
+        used: np.ndarray,
+    ) -> Tuple[List[int], Optional[int]]:
+        """Pick macro anchor foods (servings solved later) and a fixed produce side"""
+        table = self.table
+        candidates = allowed & ((table.meal_mask & MEAL_BITS[target.slot]) != 0)
+        if not candidates.any():
+            candidates = allowed
+        base = bonus - REPEAT_PENALTY * used
+        staples = candidates & ~table.is_produce
+        if not staples.any():
+            staples = candidates
+
+        # One protein, one carb and one fat anchor per main meal; snacks skip the carb
+        roles = [table.protein_density, table.fat_density]
+        if target.slot != "S":
+            roles.insert(1, table.carb_density)
+
+        chosen: List[int] = []
+        for density in roles:
+            index = self._pick(density + base, staples, chosen)
+            if index is not None:
+                chosen.append(index)
+        side = self._pick(base, candidates & table.is_produce, chosen)
+        return chosen, side
+
+    def plan_day(
+        self,
+        daily_calories: float,
+        protein: float,
+        carbs: float,
+        fat: float,
+        meal_count: int = 3,
+        restrictions: Iterable[str] = (),
+        preferences: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """Compose meals hitting the calorie and macro targets (grams)"""
+        table = self.table
+        allowed = table.allowed(frozenset(restrictions))
+        if not allowed.any():
+            raise ValueError("No foods satisfy the dietary restrictions")
+        bonus = table.preference_scores(preferences)
+        used = np.zeros(len(table))
+
+        meals = []
+        totals = np.zeros(4)
+        for target in self.meal_targets(daily_calories, protein, carbs, fat, meal_count):
+            anchors, side = self._compose_meal(target, allowed, bonus, used)
+            goal = target.vector
+            if side is not None:
+                goal = np.maximum(goal - table.nutrients[:, side], 0.0)
+            servings = _solve_servings(table.nutrients[:, anchors], goal)
+            chosen = anchors
+            if side is not None:
+                chosen = anchors + [side]
+                servings = np.append(servings, 1.0)
+            used[chosen] += 1
+            amounts = table.nutrients[:, chosen] * servings
+            meal_totals = amounts.sum(axis=1)
+            totals += meal_totals
+            meals.append({
+                "name": target.name,
+                "calories": int(round(meal_totals[0])),
+                "protein": round(float(meal_totals[1]), 1),
+                "carbs": round(float(meal_totals[2]), 1),
+                "fat": round(float(meal_totals[3]), 1),
+                "foods": [
+                    {
+                        "name": table.names[index],
+                        "servings": float(servings[j]),
+                        "serving_size": table.servings[index],
+                        "calories": int(round(amounts[0, j])),
+                        "protein": round(float(amounts[1, j]), 1),
+                        "carbs": round(float(amounts[2, j]), 1),
+                        "fat": round(float(amounts[3, j]), 1),
+                    }
+                    for j, index in enumerate(chosen)
+                ],
+            })
+
+        total_kcal = max(totals[0], 1.0)
+        return {
+            "daily_calories": int(round(totals[0])),
+            "meals": meals,
+            "macros": {
+                "protein": round(float(totals[1] * 4 / total_kcal * 100), 1),
+                "carbs": round(float(totals[2] * 4 / total_kcal * 100), 1),
+                "fat": round(float(totals[3] * 9 / total_kcal * 100), 1),
+            },
+            "macro_grams": {
+                "protein": round(float(totals[1]), 1),
+                "carbs": round(float(totals[2]), 1),
+                "fat": round(float(totals[3]), 1),
+            },
+        }
+
+
+FOOD_TABLE = FoodTable.from_records(FOOD_DATABASE)
+nutrition_engine = NutritionEngine(FOOD_TABLE)
@@ -0,0 +1,99 @@
+# FitSync AI - Plan serialization and byte cache
+# Plans are encoded once; the same bytes back the HTTP response and the Redis copy
+
+import gzip
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        # Native datetime support; non-str keys are stringified like the stdlib path
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:  # Standard library fallback
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+logger = logging.getLogger(__name__)
+
+# Matches the GZipMiddleware threshold; smaller bodies are not worth compressing
+GZIP_MIN_SIZE = 1000
+# Compressed once per plan and served many times, so favour ratio over speed
+GZIP_LEVEL = 9
+
+
+class EncodedPlan:
+    """JSON body of a plan plus its gzip variant, each computed at most once"""
+
+    __slots__ = ("body", "_gzip")
+
+    def __init__(self, body: bytes, gzip_body: Optional[bytes] = None):
+        self.body = body
+        self._gzip = gzip_body
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EncodedPlan":
+        return cls(dumps(data))
+
+    @property
+    def compressible(self) -> bool:
+        return len(self.body) >= GZIP_MIN_SIZE
+
+    @property
+    def gzip(self) -> bytes:
+        if self._gzip is None:
+            # mtime=0 keeps the output deterministic for identical plans
+            self._gzip = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+        return self._gzip
+
+    def response(self, accept_encoding: Optional[str] = None, status_code: int = 200) -> Response:
+        """Response carrying the pre-encoded bytes; GZipMiddleware skips it once Content-Encoding is set"""
+        headers = {"Vary": "Accept-Encoding"}
+        if self.compressible and accept_encoding and "gzip" in accept_encoding:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzip, status_code=status_code, media_type="application/json", headers=headers)
+        return Response(self.body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+class PlanCache:
+    """Stores plan bytes and their gzip variant side by side in Redis.
+
+    ``{prefix}:{id}`` keeps the plain JSON other readers already expect and
+    ``{prefix}:{id}:gz`` the compressed copy. The client must be created with
+    ``decode_responses=False`` so the bytes come back untouched.
+    """
+
+    def __init__(self, get_redis: Callable[[str], Any], prefix: str, ttl: int):
+        self.get_redis = get_redis
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, plan_id: str) -> str:
+        return f"{self.prefix}:{plan_id}"
+
+    async def put(self, plan_id: str, plan: EncodedPlan):
+        key = self._key(plan_id)
+        try:
+            pipe = self.get_redis(plan_id).pipeline(transaction=False)
+            pipe.setex(key, self.ttl, plan.body)
+            if plan.compressible:
+                pipe.setex(f"{key}:gz", self.ttl, plan.gzip)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to cache {key}: {e}")
+
+    async def get(self, plan_id: str) -> Optional[EncodedPlan]:
+        key = self._key(plan_id)
+        try:
+            body, gzip_body = await self.get_redis(plan_id).mget(key, f"{key}:gz")
+        except Exception as e:
+            logger.error(f"Failed to read {key}: {e}")
+            return None
+        if body is None:
+            return None
+        return EncodedPlan(body, gzip_body)
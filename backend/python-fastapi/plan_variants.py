@@ -0,0 +1,96 @@
+# FitSync AI - Precomputed workout plan variants
+# Request signatures and the serving-side store published by plan_precompute.py
+
+from typing import Any, Dict, List, Optional
+
+VARIANT_STORE_NAME = "workout_variants"
+
+# Durations are served from the nearest precomputed bucket
+DURATION_BUCKETS = (15, 20, 30, 45, 60, 75, 90, 120)
+
+# Signatures are stored in ai_interactions.signature (VARCHAR(255))
+MAX_SIGNATURE_LENGTH = 255
+SIGNATURE_FIELDS = 5
+# "-" marks an empty list; values containing a delimiter cannot round-trip
+_RESERVED = ("|", ",")
+
+
+def duration_bucket(duration_minutes: int) -> int:
+    return min(DURATION_BUCKETS, key=lambda bucket: (abs(bucket - duration_minutes), bucket))
+
+
+def _normalize_set(values: Optional[List[str]]) -> str:
+    return ",".join(sorted({value.strip().lower() for value in values or [] if value.strip()})) or "-"
+
+
+def _signable(value: str) -> bool:
+    return value != "-" and not any(char in value for char in _RESERVED)
+
+
+def variant_signature(
+    experience_level: str,
+    workout_type: str,
+    equipment: Optional[List[str]],
+    muscle_groups: Optional[List[str]],
+    duration_minutes: int,
+) -> Optional[str]:
+    """Canonical key for the request parameters that shape a plan's exercise list.
+
+    None when a value contains a delimiter or the key would be too long to
+    store; such requests are simply generated live.
+    """
+    values = [experience_level, workout_type]
+    values += [value.strip().lower() for value in (equipment or []) + (muscle_groups or []) if value.strip()]
+    if not all(_signable(value) for value in values):
+        return None
+    signature = "|".join((
+        experience_level,
+        workout_type,
+        _normalize_set(equipment),
+        _normalize_set(muscle_groups),
+        str(duration_bucket(duration_minutes)),
+    ))
+    return signature if len(signature) <= MAX_SIGNATURE_LENGTH else None
+
+
+def parse_signature(signature: str) -> Dict[str, Any]:
+    """Inverse of variant_signature, returning build_workout_prompt keyword arguments (ValueError if malformed)"""
+    parts = signature.split("|")
+    if len(parts) != SIGNATURE_FIELDS or not all(parts):
+        raise ValueError(f"Malformed signature: {signature!r}")
+    experience_level, workout_type, equipment, muscle_groups, duration = parts
+    return {
+        "experience_level": experience_level,
+        "workout_type": workout_type,
+        "equipment": [] if equipment == "-" else equipment.split(","),
+        "muscle_groups": [] if muscle_groups == "-" else muscle_groups.split(","),
+        "duration_minutes": int(duration),
+    }
+
+
+class VariantStore:
+    """Read side of the nightly variant artifact: signature -> stored plan.
+
+    The artifact is a plain dict published through ModelRegistry, so workers
+    pick up a new nightly build the same way they pick up model versions.
+    """
+
+    def __init__(self, registry: Optional[Any] = None):
+        # Imported here so request-path signature helpers stay free of joblib
+        from model_registry import HotModel, ModelRegistry
+        self.handle = HotModel(registry or ModelRegistry(VARIANT_STORE_NAME))
+
+    def load(self) -> "VariantStore":
+        self.handle.refresh()
+        return self
+
+    @property
+    def version(self) -> Optional[int]:
+        return self.handle.version
+
+    def lookup(self, signature: str) -> Optional[Dict[str, Any]]:
+        variants = self.handle.get()
+        return variants.get(signature) if variants else None
+
+    def __len__(self) -> int:
+        return len(self.handle.model or ())
@@ -0,0 +1,158 @@
+# FitSync AI - User preference model
+# Recency-weighted counters in one Redis hash per user, updated with HINCRBYFLOAT
+
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PREFERENCE_HALF_LIFE_DAYS = 30
+# Forward decay: new observations weigh 2^(age of epoch / half-life), so older
+# counts fade relative to new ones without ever rewriting them. 2024-01-01 UTC.
+PREFERENCE_EPOCH = 1704067200
+PREFERENCE_TTL = 180 * 86400
+# Bounds on what a single request may add and on the hash as a whole
+MAX_VALUES_PER_CATEGORY = 8
+MAX_VALUE_LENGTH = 32
+MAX_FIELDS = 96
+
+# Category -> hash field prefix
+CATEGORIES = {
+    "workout_type": "wt",
+    "experience_level": "lvl",
+    "duration": "dur",
+    "equipment": "eq",
+    "muscle_groups": "mg",
+    "goals": "goal",
+}
+_PREFIX_CATEGORIES = {prefix: category for category, prefix in CATEGORIES.items()}
+TOTAL_FIELD = "n"
+
+
+def observation_weight(now: Optional[float] = None) -> float:
+    days = ((now or time.time()) - PREFERENCE_EPOCH) / 86400
+    return 2.0 ** (days / PREFERENCE_HALF_LIFE_DAYS)
+
+
+def _normalize_values(values: Iterable[Any]) -> List[str]:
+    normalized = {str(value).strip().lower()[:MAX_VALUE_LENGTH] for value in values if str(value).strip()}
+    return sorted(normalized)[:MAX_VALUES_PER_CATEGORY]
+
+
+class UserPreferences:
+    """Recency-weighted share of a user's requests featuring each value (0-1)"""
+
+    __slots__ = ("frequencies", "requests")
+
+    def __init__(self, frequencies: Optional[Dict[str, Dict[str, float]]] = None, requests: float = 0.0):
+        self.frequencies = frequencies or {}
+        self.requests = requests
+
+    @classmethod
+    def from_hash(cls, fields: Dict[str, str]) -> "UserPreferences":
+        total = float(fields.get(TOTAL_FIELD, 0) or 0)
+        if total <= 0:
+            return cls()
+        frequencies: Dict[str, Dict[str, float]] = {}
+        for field, value in fields.items():
+            prefix, _, name = field.partition(":")
+            category = _PREFIX_CATEGORIES.get(prefix)
+            if category:
+                frequencies.setdefault(category, {})[name] = min(float(value) / total, 1.0)
+        # Requests in units of "fresh" requests today
+        return cls(frequencies, total / observation_weight())
+
+    def __bool__(self) -> bool:
+        return bool(self.frequencies)
+
+    def affinity(self, category: str, value: str) -> float:
+        return self.frequencies.get(category, {}).get(value, 0.0)
+
+    def top(self, category: str) -> Optional[str]:
+        values = self.frequencies.get(category)
+        return max(values, key=values.get) if values else None
+
+    def preferred(self, category: str, threshold: float = 0.5) -> List[str]:
+        """Values present in at least ``threshold`` of recent requests"""
+        return sorted(value for value, share in self.frequencies.get(category, {}).items() if share >= threshold)
+
+
+class PreferenceStore:
+    """Per-user preference counters in ``user_prefs:{user}``.
+
+    Each request adds its recency weight to one field per observed value plus
+    the total, in a single pipeline, so writes cost the same however long the
+    history is. Reads are a single HGETALL.
+    """
+
+    def __init__(self, get_redis: Callable[[Any], Any]):
+        self.get_redis = get_redis
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return f"user_prefs:{user_id}"
+
+    async def record(
+        self,
+        user_id: Any,
+        workout_type: str,
+        experience_level: str,
+        duration_bucket: int,
+        equipment: Sequence[str] = (),
+        muscle_groups: Sequence[str] = (),
+        goals: Sequence[str] = (),
+    ):
+        key = self._key(user_id)
+        weight = observation_weight()
+        observed = {
+            "workout_type": [workout_type],
+            "experience_level": [experience_level],
+            "duration": [duration_bucket],
+            "equipment": equipment,
+            "muscle_groups": muscle_groups,
+            "goals": goals,
+        }
+        try:
+            pipe = self.get_redis(user_id).pipeline(transaction=False)
+            pipe.hincrbyfloat(key, TOTAL_FIELD, weight)
+            for category, values in observed.items():
+                for value in _normalize_values(values):
+                    pipe.hincrbyfloat(key, f"{CATEGORIES[category]}:{value}", weight)
+            pipe.expire(key, PREFERENCE_TTL)
+            pipe.hlen(key)
+            field_count = (await pipe.execute())[-1]
+        except Exception as e:
+            logger.error(f"Failed to update preferences for user {user_id}: {e}")
+            return
+        if int(field_count) > MAX_FIELDS:
+            await self._prune(user_id, key)
+
+    async def _prune(self, user_id: Any, key: str):
+        """Drop the weakest values once a user's hash outgrows MAX_FIELDS (rare)"""
+        client = self.get_redis(user_id)
+        fields = await client.hgetall(key)
+        values = sorted(
+            (float(weight), field) for field, weight in fields.items() if field != TOTAL_FIELD
+        )
+        excess = len(fields) - MAX_FIELDS // 2
+        if excess > 0:
+            await client.hdel(key, *[field for _, field in values[:excess]])
+
+    async def load(self, user_id: Any) -> UserPreferences:
+        try:
+            fields = await self.get_redis(user_id).hgetall(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Preferences unavailable for user {user_id}: {e}")
+            return UserPreferences()
+        return UserPreferences.from_hash(fields)
+
+
+def weighted_sample(items: Sequence[Any], weights: Sequence[float], k: int) -> List[Any]:
+    """Sample k items without replacement, proportionally to weight (Efraimidis-Spirakis)"""
+    keyed = sorted(
+        ((random.random() ** (1.0 / weight), index) for index, weight in enumerate(weights) if weight > 0),
+        reverse=True,
+    )
+    return [items[index] for _, index in keyed[:k]]
@@ -0,0 +1,374 @@
+# FitSync AI - Prompt templates and token budgeting
+# Pre-compiled LLM prompts shared by both FastAPI services
+
+import logging
+import math
+import os
+import re
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to the offline heuristic below
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Model tiers, cheapest first. A request is routed to the first tier whose
+# complexity ceiling is not exceeded.
+MODEL_TIERS: List[Tuple[str, float]] = [
+    (os.getenv("OPENAI_MODEL_FAST", "gpt-3.5-turbo"), 3.0),
+    (os.getenv("OPENAI_MODEL_SMART", "gpt-4"), math.inf),
+]
+
+# Models that accept response_format={"type": "json_object"}. Plain "gpt-3.5-turbo"
+# is matched exactly: its -16k, -0613 and -0301 snapshots reject the parameter.
+JSON_MODE_MODELS = frozenset({"gpt-3.5-turbo"})
+JSON_MODE_MODEL_PREFIXES = (
+    "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125", "gpt-4-turbo", "gpt-4o", "gpt-4-1106", "gpt-4-0125"
+)
+
+# Chat format overhead (per message and per reply priming)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+# Completion budget for workout plans
+WORKOUT_BASE_TOKENS = 150
+WORKOUT_TOKENS_PER_EXERCISE = 70
+MIN_COMPLETION_TOKENS = 300
+MAX_COMPLETION_TOKENS = 1500
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+# Token counting
+# Encodings are loaded off the event loop by load_encodings (a warm-up
+# subsystem); tiktoken may download them on first use. Until then, and
+# without tiktoken, counts use the heuristic.
+FALLBACK_ENCODING = "cl100k_base"
+_encodings: Dict[str, Any] = {}
+
+
+@lru_cache(maxsize=32)
+def _encoding_name(model: str) -> str:
+    try:
+        return tiktoken.model.encoding_name_for_model(model)
+    except Exception:
+        return FALLBACK_ENCODING
+
+
+def load_encodings() -> Dict[str, Any]:
+    """Load the encodings for the configured model tiers (blocking; run in a thread)"""
+    if tiktoken is None:
+        return _encodings
+    for name in {FALLBACK_ENCODING, *(_encoding_name(model) for model, _ in MODEL_TIERS)}:
+        if name in _encodings:
+            continue
+        try:
+            _encodings[name] = tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(f"tiktoken encoding {name} unavailable, using heuristic: {e}")
+    return _encodings
+
+
+def _get_encoding(model: str):
+    """A loaded tiktoken encoding for the model, or None (never loads on the caller's thread)"""
+    if not _encodings:
+        return None
+    return _encodings.get(_encoding_name(model)) or _encodings.get(FALLBACK_ENCODING)
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Count tokens locally without calling the API"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # Heuristic: one token per word/punctuation piece, plus one per extra 4 chars
+    return sum(1 + (len(piece) - 1) // 4 for piece in _WORD_RE.findall(text))
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str = "gpt-4") -> int:
+    """Count prompt tokens for a chat completion request"""
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        total += TOKENS_PER_MESSAGE + count_tokens(message["content"], model)
+    return total
+
+
+# Template compilation
+class PromptTemplate:
+    """A prompt template split once into static and dynamic segments"""
+
+    def __init__(self, name: str, system: str, user: str):
+        self.name = name
+        self.system = system.strip()
+        self.segments: List[Tuple[str, Optional[str]]] = [
+            (literal, field_name)
+            for literal, field_name, _, _ in string.Formatter().parse(user.strip())
+        ]
+        self.fields = [field_name for _, field_name in self.segments if field_name]
+        self._static_tokens: Dict[str, int] = {}
+
+    def static_tokens(self, model: str) -> int:
+        """Token count of the system prompt and literal user segments (cached per model)"""
+        if model not in self._static_tokens:
+            literal = "".join(literal for literal, _ in self.segments)
+            self._static_tokens[model] = (
+                2 * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+                + count_tokens(self.system, model)
+                + count_tokens(literal, model)
+            )
+        return self._static_tokens[model]
+
+    def render(self, model: str, **values: Any) -> Tuple[List[Dict[str, str]], int]:
+        """Fill the template and return chat messages with their estimated token count"""
+        parts = []
+        dynamic_tokens = 0
+        for literal, field_name in self.segments:
+            parts.append(literal)
+            if field_name:
+                value = str(values[field_name])
+                parts.append(value)
+                dynamic_tokens += count_tokens(value, model)
+        messages = [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": "".join(parts)},
+        ]
+        return messages, self.static_tokens(model) + dynamic_tokens
+
+
+@dataclass
+class CompiledPrompt:
+    template: str
+    model: str
+    messages: List[Dict[str, str]]
+    prompt_tokens: int
+    max_tokens: int
+    complexity: float
+    json_mode: bool = False
+
+    def completion_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for openai.ChatCompletion.acreate"""
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "messages": self.messages,
+            "max_tokens": self.max_tokens,
+        }
+        if self.json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+
+@dataclass
+class TokenUsage:
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+    estimated: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_ms": round(self.latency_ms, 2),
+            "estimated": self.estimated,
+        }
+
+
+# Compact output contract validated by workout_parser.parse_workout_json
+WORKOUT_RESPONSE_SCHEMA = (
+    '{"exercises":[{"name":str,"sets":int,"reps":str,"rest_seconds":int,"instructions":str}]}'
+)
+
+WORKOUT_TEMPLATE = PromptTemplate(
+    name="workout_plan",
+    system=(
+        "You are an expert fitness trainer and exercise physiologist. Create detailed, safe, and effective workout plans. "
+        "Respond with JSON only, matching: " + WORKOUT_RESPONSE_SCHEMA
+    ),
+    user="""
+Create a personalized workout plan with the following specifications:
+- Experience Level: {experience_level}
+- Duration: {duration_minutes} minutes
+- Workout Type: {workout_type}
+- Target Muscle Groups: {muscle_groups}
+- Available Equipment: {equipment}
+- Fitness Goals: {goals}
+- Limitations: {limitations}
+- Recommended intensity: {intensity}
+
+Return exactly {exercise_count} main exercises with sets, reps, and rest periods.
+""",
+)
+
+
+CHAT_SYSTEM_PROMPT = (
+    "You are FitSync AI, a knowledgeable fitness and nutrition assistant. "
+    "Provide helpful, encouraging, and scientifically-backed advice."
+)
+
+# Rolling summary of chat turns that fell out of the verbatim history window
+CHAT_SUMMARY_MAX_TOKENS = 250
+
+CHAT_SUMMARY_TEMPLATE = PromptTemplate(
+    name="chat_summary",
+    system=(
+        "You maintain a running summary of a conversation between a user and a fitness assistant. "
+        "Keep the user's goals, constraints, injuries, preferences and any advice already given. "
+        "Be concise and factual."
+    ),
+    user="""
+Current summary:
+{summary}
+
+Earlier messages to fold in:
+{transcript}
+
+Return the updated summary in under {word_limit} words.
+""",
+)
+
+
+# Budgeting and routing
+def workout_exercise_count(duration_minutes: int) -> int:
+    """Number of main exercises for a workout of the given length (4-8)"""
+    return min(max(4, duration_minutes // 8), 8)
+
+
+def size_workout_max_tokens(duration_minutes: int, exercise_count: Optional[int] = None) -> int:
+    """Completion budget sized to the number of exercises the plan will contain"""
+    if exercise_count is None:
+        exercise_count = workout_exercise_count(duration_minutes)
+    budget = WORKOUT_BASE_TOKENS + WORKOUT_TOKENS_PER_EXERCISE * exercise_count
+    return max(MIN_COMPLETION_TOKENS, min(budget, MAX_COMPLETION_TOKENS))
+
+
+def estimate_workout_complexity(
+    experience_level: str,
+    workout_type: str,
+    duration_minutes: int,
+    goals: List[str],
+    limitations: List[str],
+    muscle_groups: List[str],
+) -> float:
+    """Score how much reasoning a workout request needs (0 = trivial)"""
+    score = 0.0
+    score += {"beginner": 0.0, "intermediate": 0.5, "advanced": 1.0}.get(experience_level, 0.5)
+    score += 1.0 if workout_type == "mixed" else 0.0
+    score += 0.5 if duration_minutes > 60 else 0.0
+    score += 0.5 * max(0, len(goals) - 1)
+    score += 0.25 * max(0, len(muscle_groups) - 2)
+    # Injuries need careful exercise substitution
+    score += 2.0 * len(limitations)
+    return score
+
+
+def supports_json_mode(model: str) -> bool:
+    return model in JSON_MODE_MODELS or model.startswith(JSON_MODE_MODEL_PREFIXES)
+
+
+def select_model(complexity: float) -> str:
+    """Pick the cheapest model tier able to handle the given complexity"""
+    for model, ceiling in MODEL_TIERS:
+        if complexity <= ceiling:
+            return model
+    return MODEL_TIERS[-1][0]
+
+
+def build_workout_prompt(
+    experience_level: str,
+    workout_type: str,
+    duration_minutes: int,
+    equipment: List[str],
+    muscle_groups: List[str],
+    goals: Optional[List[str]] = None,
+    limitations: Optional[List[str]] = None,
+    intensity: Optional[float] = None,
+) -> CompiledPrompt:
+    """Render the workout prompt with a sized completion budget and a routed model"""
+    goals = goals or []
+    limitations = limitations or []
+    exercise_count = workout_exercise_count(duration_minutes)
+    complexity = estimate_workout_complexity(
+        experience_level, workout_type, duration_minutes, goals, limitations, muscle_groups
+    )
+    model = select_model(complexity)
+    messages, prompt_tokens = WORKOUT_TEMPLATE.render(
+        model,
+        experience_level=experience_level,
+        duration_minutes=duration_minutes,
+        workout_type=workout_type,
+        muscle_groups=", ".join(muscle_groups) if muscle_groups else "full body",
+        equipment=", ".join(equipment) if equipment else "bodyweight only",
+        goals=", ".join(goals) if goals else "general fitness",
+        limitations=", ".join(limitations) if limitations else "none",
+        intensity=f"{intensity:.2f}" if intensity is not None else "moderate",
+        exercise_count=exercise_count,
+    )
+    return CompiledPrompt(
+        template=WORKOUT_TEMPLATE.name,
+        model=model,
+        messages=messages,
+        prompt_tokens=prompt_tokens,
+        max_tokens=size_workout_max_tokens(duration_minutes, exercise_count),
+        complexity=complexity,
+        json_mode=supports_json_mode(model),
+    )
+
+
+def build_summary_prompt(summary: str, messages: List[Dict[str, str]]) -> CompiledPrompt:
+    """Render the rolling-summary prompt on the cheapest model tier"""
+    model = MODEL_TIERS[0][0]
+    transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+    rendered, prompt_tokens = CHAT_SUMMARY_TEMPLATE.render(
+        model,
+        summary=summary or "(none yet)",
+        transcript=transcript,
+        word_limit=CHAT_SUMMARY_MAX_TOKENS * 3 // 4,
+    )
+    return CompiledPrompt(
+        template=CHAT_SUMMARY_TEMPLATE.name,
+        model=model,
+        messages=rendered,
+        prompt_tokens=prompt_tokens,
+        max_tokens=CHAT_SUMMARY_MAX_TOKENS,
+        complexity=0.0,
+    )
+
+
+def record_usage(prompt: CompiledPrompt, response: Any, latency_ms: float, completion: str = "") -> TokenUsage:
+    """Build token usage for a completed call, preferring the API's own counts"""
+    usage = getattr(response, "usage", None) if response is not None else None
+    if usage is not None:
+        result = TokenUsage(
+            model=prompt.model,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            latency_ms=latency_ms,
+        )
+    else:
+        result = TokenUsage(
+            model=prompt.model,
+            prompt_tokens=prompt.prompt_tokens,
+            completion_tokens=count_tokens(completion, prompt.model),
+            latency_ms=latency_ms,
+            estimated=True,
+        )
+    logger.info(
+        f"LLM {prompt.template} - Model: {result.model} - "
+        f"Tokens: {result.prompt_tokens}+{result.completion_tokens} "
+        f"(budget {prompt.max_tokens}) - Time: {latency_ms:.1f}ms"
+    )
+    return result
@@ -0,0 +1,223 @@
+# FitSync AI - Rate limiting and LLM token quotas
+# GCRA limits enforced atomically in Redis, with a local lease pre-check
+
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+DAILY_TOKEN_QUOTA = int(os.getenv("DAILY_TOKEN_QUOTA", "200000"))
+MAX_LOCAL_ENTRIES = 10000
+LEASE_FRACTION = 4
+MAX_LEASE = 10
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int          # requests allowed per period
+    period: float       # seconds
+    burst: Optional[int] = None
+
+    @property
+    def emission_interval_ms(self) -> float:
+        return self.period * 1000 / self.limit
+
+    @property
+    def lease_size(self) -> int:
+        # Tokens a worker reserves per Redis round trip. A quarter of the burst lets
+        # low limits (10/min) skip Redis for most requests, while a user spread
+        # across workers loses at most the unused part of a lease until it lapses.
+        return max(1, min(MAX_LEASE, math.ceil((self.burst or self.limit) / LEASE_FRACTION)))
+
+
+# Per-route limits for LLM-backed endpoints
+ROUTE_LIMITS: Dict[str, RateLimit] = {
+    "ai_workout_plan": RateLimit(limit=10, period=60),
+    "ai_chat": RateLimit(limit=30, period=60),
+    "workout_generate": RateLimit(limit=10, period=60),
+    "chat": RateLimit(limit=30, period=60),
+}
+
+# GCRA with batch leasing and the daily token quota checked in one round trip.
+# KEYS[1] = rate key, KEYS[2] = quota key
+# ARGV = emission interval ms, burst, requested tokens, daily token quota
+# Returns {granted, retry_after_ms, tokens_used_today}
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local quota = tonumber(ARGV[4])
+
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+if quota > 0 and used >= quota then
+    return {0, -1, used}
+end
+
+local t = redis.call('TIME')
+local now = t[1] * 1000 + t[2] / 1000
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then
+    tat = now
+end
+
+local available = math.floor((now + burst * interval - tat) / interval)
+local granted = math.min(requested, available)
+if granted < 1 then
+    return {0, math.ceil(tat - now - (burst - 1) * interval), used}
+end
+
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil(tat - now) + 1000)
+return {granted, 0, used}
+"""
+
+
+class _LocalState:
+    __slots__ = ("tokens", "lease_expires", "blocked_until")
+
+    def __init__(self):
+        self.tokens = 0
+        self.lease_expires = 0.0
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    """Per-user, per-route limiter.
+
+    Each worker leases a small batch of tokens from Redis and spends them
+    locally, and remembers denials until their retry time, so most
+    decisions are answered from process memory. Redis errors fail open.
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[str], Any],
+        limits: Dict[str, RateLimit] = ROUTE_LIMITS,
+        daily_token_quota: int = DAILY_TOKEN_QUOTA,
+    ):
+        self.get_redis = get_redis
+        self.limits = limits
+        self.daily_token_quota = daily_token_quota
+        self._script = None
+        self._local: "OrderedDict[Tuple[str, str], _LocalState]" = OrderedDict()
+        self._quota_exhausted: Dict[str, float] = {}
+
+    def _state(self, key: Tuple[str, str]) -> _LocalState:
+        state = self._local.get(key)
+        if state is None:
+            state = self._local[key] = _LocalState()
+            if len(self._local) > MAX_LOCAL_ENTRIES:
+                self._local.popitem(last=False)
+        else:
+            self._local.move_to_end(key)
+        return state
+
+    def check_local(self, user_id: str, route: str) -> Optional[float]:
+        """Decide from local state only: 0 allows, >0 denies with Retry-After, None needs Redis"""
+        now = time.monotonic()
+        exhausted_until = self._quota_exhausted.get(user_id)
+        if exhausted_until is not None:
+            if now < exhausted_until:
+                return exhausted_until - now
+            del self._quota_exhausted[user_id]
+        state = self._state((user_id, route))
+        if now < state.blocked_until:
+            return state.blocked_until - now
+        if state.tokens > 0 and now < state.lease_expires:
+            state.tokens -= 1
+            return 0.0
+        return None
+
+    def _get_script(self, client: Any):
+        # One script object serves every shard; the client is passed per call
+        if self._script is None:
+            self._script = client.register_script(GCRA_SCRIPT)
+        return self._script
+
+    async def check(self, user_id: Any, route: str) -> float:
+        """Return 0 when the request may proceed, otherwise seconds until retry"""
+        user_id = str(user_id)
+        limit = self.limits.get(route)
+        if limit is None:
+            return 0.0
+        local = self.check_local(user_id, route)
+        if local is not None:
+            return local
+
+        client = self.get_redis(user_id)
+        if client is None:
+            return 0.0
+        burst = limit.burst or limit.limit
+        try:
+            granted, retry_after_ms, _ = await self._get_script(client)(
+                keys=[f"ratelimit:{route}:{user_id}", _quota_key(user_id)],
+                args=[limit.emission_interval_ms, burst, limit.lease_size, self.daily_token_quota],
+                client=client,
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit check failed open for {route}: {e}")
+            return 0.0
+
+        now = time.monotonic()
+        granted = int(granted)
+        if granted > 0:
+            state = self._state((user_id, route))
+            state.tokens = granted - 1
+            # Unused leased tokens lapse after one emission interval per token
+            state.lease_expires = now + granted * limit.emission_interval_ms / 1000
+            return 0.0
+        if int(retry_after_ms) < 0:
+            retry_after = _seconds_until_utc_midnight()
+            self._quota_exhausted[user_id] = now + retry_after
+            return retry_after
+        retry_after = int(retry_after_ms) / 1000
+        self._state((user_id, route)).blocked_until = now + retry_after
+        return retry_after
+
+    async def enforce(self, user_id: Any, route: str):
+        """Raise 429 with Retry-After when the user is over the route limit or daily quota"""
+        retry_after = await self.check(user_id, route)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+    async def record_tokens(self, user_id: Any, tokens: int):
+        """Charge actual LLM usage against the user's daily token quota"""
+        if tokens <= 0:
+            return
+        user_id = str(user_id)
+        client = self.get_redis(user_id)
+        if client is None:
+            return
+        key = _quota_key(user_id)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.incrby(key, tokens)
+            pipe.expire(key, 2 * 86400)
+            used, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record token usage for user {user_id}: {e}")
+            return
+        if self.daily_token_quota and int(used) >= self.daily_token_quota:
+            self._quota_exhausted[user_id] = time.monotonic() + _seconds_until_utc_midnight()
+
+
+def _quota_key(user_id: str) -> str:
+    return f"token_quota:{user_id}:{datetime.utcnow():%Y%m%d}"
+
+
+def _seconds_until_utc_midnight() -> float:
+    now = datetime.utcnow()
+    midnight = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    return (midnight - now).total_seconds()
@@ -0,0 +1,288 @@
+# FitSync AI - Pre-fork process supervisor
+# Loads the app and its model artifacts once, then forks workers that share them copy-on-write
+#
+# Run:      WORKER_ID_BASE=0 python supervisor.py enhanced-main.py --workers 4 --port 8082
+#           (next host: WORKER_ID_BASE=8, and so on; required when NODE_ENV=production)
+# Reload:   kill -HUP <pid>    refresh model artifacts, then replace workers one at a time
+# Stop:     kill -TERM <pid>   workers stop accepting, drain and exit
+# Code changes need a full restart; SIGHUP only re-forks from the loaded code.
+
+import argparse
+import gc
+import importlib.util
+import logging
+import math
+import os
+import select
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from ids import MAX_WORKER_ID, generator
+from lifecycle import DRAIN_TIMEOUT, Lifecycle
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "2"))
+STARTUP_TIMEOUT = float(os.getenv("WORKER_STARTUP_TIMEOUT", "60"))
+# Drain budget plus headroom for lifespan shutdown before a worker is killed
+STOP_TIMEOUT = DRAIN_TIMEOUT + 10
+RESPAWN_DELAY = 1.0
+# Each slot alternates between two worker IDs so a draining worker and its
+# replacement never mint IDs under the same one (see ids.py). Every host needs
+# its own range of 2 * workers IDs starting at WORKER_ID_BASE.
+WORKER_ID_BASE = os.getenv("WORKER_ID_BASE")
+
+
+def worker_id_base() -> int:
+    if WORKER_ID_BASE is None:
+        if os.getenv("NODE_ENV") == "production":
+            raise RuntimeError("WORKER_ID_BASE must be set per host in production, or replicas mint colliding IDs")
+        return 0
+    return int(WORKER_ID_BASE)
+
+
+def load_app_module(path: str) -> ModuleType:
+    """Import a service file by path (enhanced-main.py is not an importable module name)"""
+    name = Path(path).stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that reports readiness to the supervisor and drains the app before shutdown"""
+
+    def __init__(self, config: uvicorn.Config, lifecycle: Optional[Lifecycle] = None, ready_fd: Optional[int] = None):
+        super().__init__(config)
+        self.lifecycle = lifecycle
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets)
+        if self.started and self.ready_fd is not None:
+            try:
+                os.write(self.ready_fd, b"1")
+            except OSError:
+                pass  # The supervisor stopped waiting
+            os.close(self.ready_fd)
+            self.ready_fd = None
+
+    async def shutdown(self, sockets=None):
+        # Stop accepting first, then let the app fail readiness and close WebSockets
+        for server in self.servers:
+            server.close()
+        if self.lifecycle is not None:
+            await self.lifecycle.begin_drain()
+        await super().shutdown(sockets)
+
+
+@dataclass
+class Worker:
+    pid: int
+    slot: int
+    worker_id: int
+    ready_fd: int
+    stop_deadline: Optional[float] = None
+
+
+class Supervisor:
+    def __init__(self, app_path: str, host: str = "0.0.0.0", port: int = 8000, workers: int = WORKERS, preload: Optional[List[str]] = None):
+        self.worker_id_base = worker_id_base()
+        if self.worker_id_base < 0 or self.worker_id_base + 2 * workers - 1 > MAX_WORKER_ID:
+            raise ValueError(f"WORKER_ID_BASE + 2 * workers must be between 0 and {MAX_WORKER_ID + 1}")
+        self.module = load_app_module(app_path)
+        self.preload_names = preload
+        self.workers = workers
+        self.config = uvicorn.Config(
+            self.module.app,
+            host=host,
+            port=port,
+            proxy_headers=True,
+            timeout_graceful_shutdown=math.ceil(DRAIN_TIMEOUT),
+        )
+        self.active: Dict[int, Worker] = {}
+        self.retiring: Dict[int, Worker] = {}
+        self._generations: Dict[int, int] = {}
+        self._stop = False
+        self._reload = False
+
+    def preload(self):
+        """Load model artifacts in the parent and freeze them out of the GC's reach"""
+        subsystems = getattr(self.module, "subsystems", None)
+        if subsystems is not None:
+            subsystems.preload(self.preload_names)
+        # Collections in the workers would otherwise touch (and copy) every preloaded object
+        gc.collect()
+        gc.freeze()
+
+    # Worker processes
+
+    def _run_worker(self, worker_id: int, ready_fd: int):
+        os.environ["WORKER_ID"] = str(worker_id)
+        generator.reset()
+        # Reloads are the supervisor's business; uvicorn handles SIGTERM/SIGINT from here on
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        server = DrainingServer(self.config, getattr(self.module, "lifecycle", None), ready_fd)
+        server.run(sockets=[self.socket])
+
+    def _spawn(self, slot: int) -> Worker:
+        generation = self._generations[slot] = self._generations.get(slot, -1) + 1
+        worker_id = self.worker_id_base + 2 * slot + generation % 2
+        for old in list(self.retiring.values()):
+            if old.worker_id == worker_id:
+                self._wait_exit(old)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            code = 0
+            try:
+                self._run_worker(worker_id, write_fd)
+            except BaseException as e:
+                if not isinstance(e, SystemExit) or e.code:
+                    logger.exception(f"Worker {slot} crashed")
+                    code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        worker = Worker(pid, slot, worker_id, read_fd)
+        logger.info(f"Spawned worker {slot} (pid {pid}, worker id {worker_id})")
+        return worker
+
+    def _wait_ready(self, worker: Worker, timeout: float) -> bool:
+        readable, _, _ = select.select([worker.ready_fd], [], [], timeout)
+        ready = bool(readable) and os.read(worker.ready_fd, 1) == b"1"
+        os.close(worker.ready_fd)
+        return ready
+
+    def _retire(self, worker: Worker):
+        worker.stop_deadline = time.monotonic() + STOP_TIMEOUT
+        self.retiring[worker.pid] = worker
+        self._signal(worker.pid, signal.SIGTERM)
+
+    def _wait_exit(self, worker: Worker):
+        while worker.pid in self.retiring:
+            self._reap()
+            self._enforce_deadlines()
+            time.sleep(0.1)
+
+    @staticmethod
+    def _signal(pid: int, sig: int):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> List[Worker]:
+        """Collect exited children; returns active workers that died unexpectedly"""
+        crashed = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self.retiring:
+                worker = self.retiring.pop(pid)
+                logger.info(f"Worker {worker.slot} (pid {pid}) exited after draining")
+                continue
+            for worker in list(self.active.values()):
+                if worker.pid == pid:
+                    logger.error(f"Worker {worker.slot} (pid {pid}) died with status {status}")
+                    del self.active[worker.slot]
+                    crashed.append(worker)
+        return crashed
+
+    def _enforce_deadlines(self):
+        now = time.monotonic()
+        for worker in self.retiring.values():
+            if worker.stop_deadline is not None and now > worker.stop_deadline:
+                logger.error(f"Worker {worker.slot} (pid {worker.pid}) missed its drain deadline, killing")
+                self._signal(worker.pid, signal.SIGKILL)
+                worker.stop_deadline = None
+
+    # Supervisor loop
+
+    def rolling_restart(self):
+        """Replace workers one at a time; each old worker drains only once its replacement serves"""
+        logger.info("Rolling restart: refreshing preloaded subsystems")
+        gc.unfreeze()
+        self.preload()
+        for slot in sorted(self.active):
+            if self._stop:
+                return
+            replacement = self._spawn(slot)
+            if not self._wait_ready(replacement, STARTUP_TIMEOUT):
+                logger.error(f"Replacement for worker {slot} failed to start; keeping the old worker")
+                self._retire(replacement)
+                return
+            self._retire(self.active[slot])
+            self.active[slot] = replacement
+        logger.info("Rolling restart complete")
+
+    def _handle_stop(self, signum, frame):
+        self._stop = True
+
+    def _handle_reload(self, signum, frame):
+        self._reload = True
+
+    def run(self):
+        self.socket = self.config.bind_socket()
+        self.preload()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        for slot in range(self.workers):
+            worker = self.active[slot] = self._spawn(slot)
+            if not self._wait_ready(worker, STARTUP_TIMEOUT):
+                logger.error(f"Worker {slot} did not report ready within {STARTUP_TIMEOUT:.0f}s")
+
+        while not self._stop:
+            for worker in self._reap():
+                time.sleep(RESPAWN_DELAY)
+                replacement = self.active[worker.slot] = self._spawn(worker.slot)
+                self._wait_ready(replacement, STARTUP_TIMEOUT)
+            self._enforce_deadlines()
+            if self._reload:
+                self._reload = False
+                self.rolling_restart()
+            time.sleep(0.2)
+        self.stop()
+
+    def stop(self):
+        logger.info(f"Stopping {len(self.active)} workers")
+        for worker in list(self.active.values()):
+            self._retire(worker)
+        self.active.clear()
+        for worker in list(self.retiring.values()):
+            self._wait_exit(worker)
+        self.socket.close()
+        logger.info("All workers stopped")
+
+
+def serve(app_path: str, host: str = "0.0.0.0", port: int = 8000, workers: int = WORKERS, preload: Optional[List[str]] = None):
+    Supervisor(app_path, host, port, workers, preload).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-fork supervisor with rolling restarts")
+    parser.add_argument("app", help="service file, e.g. enhanced-main.py")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--preload", nargs="*", help="subsystems to load before forking (default: all)")
+    args = parser.parse_args()
+    serve(args.app, args.host, args.port, args.workers, args.preload)
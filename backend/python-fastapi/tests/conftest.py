@@ -0,0 +1,7 @@
+# FitSync AI - Test configuration
+# Service modules live flat in the parent directory, like the benchmarks import them
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
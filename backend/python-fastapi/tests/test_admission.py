@@ -0,0 +1,122 @@
+# FitSync AI - Admission control tests
+
+import asyncio
+
+from admission import CRITICAL, LLM, STANDARD, AdmissionClass, AdmissionController, AdmissionMiddleware
+
+
+def make_controller(concurrency=1, queue=2, timeout=0.2):
+    return AdmissionController({
+        LLM: AdmissionClass(max_concurrency=concurrency, max_queue=queue, queue_timeout=timeout),
+        STANDARD: AdmissionClass(max_concurrency=100, max_queue=100, queue_timeout=1),
+    })
+
+
+def test_queue_hands_slots_over_in_order():
+    async def run():
+        controller = make_controller()
+        assert await controller.acquire(LLM)
+        order = []
+
+        async def waiter(name):
+            assert await controller.acquire(LLM)
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        # Queue is full: shed immediately rather than wait
+        assert not await controller.acquire(LLM)
+        assert controller.snapshot()[LLM]["queued"] == 2
+
+        controller.release(LLM)
+        await asyncio.sleep(0.01)
+        assert order == ["first"]
+        controller.release(LLM)
+        await asyncio.gather(*tasks)
+        assert order == ["first", "second"]
+        # The slot was handed over each time, never freed and retaken
+        assert controller.snapshot()[LLM]["in_flight"] == 1
+        controller.release(LLM)
+        assert controller.snapshot()[LLM]["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_queued_requests_are_shed_at_the_deadline():
+    async def run():
+        controller = make_controller(timeout=0.05)
+        assert await controller.acquire(LLM)
+        assert not await controller.acquire(LLM)
+        snapshot = controller.snapshot()[LLM]
+        assert snapshot["timed_out"] == 1 and snapshot["queued"] == 0
+        controller.release(LLM)
+        assert controller.snapshot()[LLM]["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        controller = make_controller()
+        assert await controller.acquire(LLM)
+        task = asyncio.create_task(controller.acquire(LLM))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        controller.release(LLM)
+        snapshot = controller.snapshot()[LLM]
+        assert snapshot["in_flight"] == 0 and snapshot["queued"] == 0
+        assert await controller.acquire(LLM)
+
+    asyncio.run(run())
+
+
+async def call(middleware, path):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path, "headers": [], "query_string": b""}
+    await middleware(scope, receive, send)
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    return start["status"], dict(start["headers"]), scope
+
+
+def test_middleware_sheds_degrades_and_bypasses():
+    async def run():
+        controller = make_controller(queue=0)
+        gate = asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["path"] == "/api/ai/chat":
+                await gate.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = AdmissionMiddleware(
+            app,
+            controller,
+            routes=[("/health", CRITICAL), ("/api/ai", LLM)],
+            degrade=["/api/ai/workout-plan"],
+        )
+        busy = asyncio.create_task(call(middleware, "/api/ai/chat"))
+        await asyncio.sleep(0)
+
+        status, headers, _ = await call(middleware, "/api/ai/chat")
+        assert status == 503 and headers[b"retry-after"] == b"1"
+        status, _, scope = await call(middleware, "/api/ai/workout-plan")
+        assert status == 200 and scope["state"]["degraded"]
+        assert (await call(middleware, "/health"))[0] == 200
+        assert (await call(middleware, "/api/workouts"))[0] == 200
+
+        gate.set()
+        assert (await busy)[0] == 200
+        snapshot = controller.snapshot()[LLM]
+        assert (snapshot["in_flight"], snapshot["shed"], snapshot["degraded"]) == (0, 1, 1)
+        assert 'admission_shed_total{class="llm"} 1' in controller.render_metrics()
+
+    asyncio.run(run())
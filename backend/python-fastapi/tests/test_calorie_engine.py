@@ -0,0 +1,58 @@
+# FitSync AI - Calorie engine tests
+
+import math
+
+from calorie_engine import MAX_REPS, MAX_SETS, CalorieEngine, calorie_engine, parse_reps
+
+
+def test_rep_prescriptions():
+    assert parse_reps("8-12") == (10.0, 0.0)
+    assert parse_reps("30 seconds") == (0.0, 30.0)
+    assert parse_reps("2 min") == (0.0, 120.0)
+    assert parse_reps(12) == (12.0, 0.0)
+
+
+def test_malformed_fields_use_defaults():
+    exercises = [
+        {"name": "Push-ups", "sets": 3, "reps": "8-12", "rest_seconds": 60},
+        {"name": ["x"], "id": {"a": 1}, "sets": "three", "reps": [1, 2], "rest_seconds": "abc"},
+        "not an exercise",
+    ]
+    result = calorie_engine.estimate(exercises, 80, 45)
+    assert len(result["per_exercise"]) == 3
+    assert result["per_exercise"][2] == 0
+    assert result["total"] > 0
+
+
+def test_huge_values_are_clamped():
+    exercise = {"name": "Burpees", "sets": 1e300, "reps": 20}
+    totals = calorie_engine.score_history([[exercise]], 70, [30])
+    capped = calorie_engine.score_history([[{"name": "Burpees", "sets": MAX_SETS, "reps": 20}]], 70, [30])
+    assert totals == capped
+
+    reps = calorie_engine.estimate([{"name": "Burpees", "sets": 3, "reps": "9" * 41}])
+    assert reps == calorie_engine.estimate([{"name": "Burpees", "sets": 3, "reps": MAX_REPS}])
+    assert calorie_engine.estimate([{"name": "Burpees", "sets": 10 ** 400}], 10 ** 400)["total"] >= 0
+
+
+def test_non_finite_inputs_fall_back():
+    exercises = [{"name": "Burpees", "sets": float("nan"), "reps": float("inf"), "rest_seconds": -5}]
+    totals = calorie_engine.score_history([exercises], [float("nan")], [float("inf")])
+    assert all(math.isfinite(total) for total in totals)
+
+
+def test_history_matches_single_estimates():
+    plans = [
+        [{"name": "Bench Press", "sets": 4, "reps": "8"}],
+        [],
+        [{"name": "Jumping Jacks", "sets": 3, "reps": "30 sec", "rest_seconds": 30}],
+    ]
+    totals = calorie_engine.score_history(plans, [80, None, 60], [45, 20, 30])
+    assert totals[1] > 0  # warm-up only
+    assert totals[0] == calorie_engine.estimate(plans[0], 80, 45)["total"]
+    assert totals[2] == calorie_engine.estimate(plans[2], 60, 30)["total"]
+
+
+def test_unknown_exercises_use_default_met():
+    engine = CalorieEngine(exercises=[])
+    assert engine.estimate([{"name": "Mystery", "sets": 3, "reps": 10}], 70)["total"] > 0
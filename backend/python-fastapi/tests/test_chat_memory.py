@@ -0,0 +1,84 @@
+# FitSync AI - Chat memory tests
+
+import asyncio
+import json
+
+import pytest
+
+from chat_memory import ChatMemory, extractive_summary
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+
+def make_memory(**kwargs):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return ChatMemory(lambda _: client, turns=2, **kwargs), client
+
+
+async def contents(client, user_id):
+    return [json.loads(entry)["content"] for entry in await client.lrange(f"chat_history:{user_id}", 0, -1)]
+
+
+def test_prompt_stays_within_budget():
+    async def run():
+        memory, _ = make_memory(prompt_budget=100)
+        for turn in range(10):
+            await memory.append(1, f"question {turn} " * 10, f"answer {turn} " * 10)
+        summary, history = await memory.load(1)
+        assert summary is None
+        assert [entry["content"].split()[1] for entry in history] == ["8", "8", "9", "9"]
+        messages, used = memory.build_messages("system", summary, history, "next")
+        assert used <= 100
+        assert messages[0]["role"] == "system" and messages[-1]["content"] == "next"
+        # Oldest turns are dropped first to fit the budget
+        assert [message["content"].split()[:2] for message in messages[1:-1]] == [["question", "9"], ["answer", "9"]]
+
+    asyncio.run(run())
+
+
+def test_compact_folds_overflow_into_summary():
+    async def run():
+        memory, client = make_memory()
+        due = [await memory.append(1, f"q{turn}. more", f"a{turn}") for turn in range(4)]
+        assert due == [False, False, False, True]
+        await memory.compact(1, extractive_summary)
+        assert await contents(client, 1) == ["q2. more", "a2", "q3. more", "a3"]
+        summary, _ = await memory.load(1)
+        assert summary["content"] == "q0 | q1"
+        assert not await client.exists("chat_summary_lock:1")
+
+    asyncio.run(run())
+
+
+def test_compact_keeps_turns_appended_while_summarizing():
+    async def run():
+        memory, client = make_memory()
+        for turn in range(4):
+            await memory.append(1, f"q{turn}", f"a{turn}")
+        # Small hard cap, so the concurrent append trims part of the folded prefix
+        memory.max_messages = 8
+
+        async def summarize(previous, messages):
+            await memory.append(1, "q4", "a4")
+            return " ".join(message["content"] for message in messages)
+
+        await memory.compact(1, summarize)
+        assert await contents(client, 1) == ["q2", "a2", "q3", "a3", "q4", "a4"]
+        summary, _ = await memory.load(1)
+        assert summary["content"] == "q0 a0 q1 a1"
+
+    asyncio.run(run())
+
+
+def test_compact_skips_when_locked():
+    async def run():
+        memory, client = make_memory()
+        for turn in range(4):
+            await memory.append(1, f"q{turn}", f"a{turn}")
+        await client.set("chat_summary_lock:1", "1")
+        await memory.compact(1, extractive_summary)
+        assert len(await contents(client, 1)) == 8
+        assert await client.get("chat_summary:1") is None
+
+    asyncio.run(run())
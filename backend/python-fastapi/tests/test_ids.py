@@ -0,0 +1,68 @@
+# FitSync AI - ID generation tests
+
+import os
+import time
+
+import pytest
+
+import ids
+from ids import IdGenerator, decode_id, encode_id, id_from_key
+
+
+def test_ids_are_strictly_increasing():
+    generator = IdGenerator(worker_id=3)
+    minted = [generator.next_id() for _ in range(20000)]
+    assert minted == sorted(set(minted))
+    assert all((value >> ids.SEQUENCE_BITS) & ids.MAX_WORKER_ID == 3 for value in minted)
+
+
+def test_clock_stepping_back_never_repeats(monkeypatch):
+    generator = IdGenerator(worker_id=1)
+    now = [2 * 10**18]
+    monkeypatch.setattr(time, "time_ns", lambda: now[0])
+    first = [generator.next_id() for _ in range(5000)]  # overflows the sequence into later milliseconds
+    now[0] -= 10**9
+    second = [generator.next_id() for _ in range(10)]
+    assert first + second == sorted(set(first + second))
+
+
+def test_encoding_round_trips_and_sorts():
+    generator = IdGenerator(worker_id=7)
+    minted = [generator.next_id() for _ in range(1000)]
+    encoded = [encode_id(value) for value in minted]
+    assert [decode_id(text) for text in encoded] == minted
+    assert encoded == sorted(encoded)
+    assert decode_id(encoded[0].lower()) == minted[0]
+    assert id_from_key(f"workout_42_{encoded[0]}") == minted[0]
+    assert id_from_key("workout_42_1700000000") is None
+    for bad in ("", "0" * 12, "I" * 13, "Z" * 13):
+        with pytest.raises(ValueError):
+            decode_id(bad)
+
+
+def test_forked_worker_mints_distinct_ids(monkeypatch):
+    if not hasattr(os, "fork"):
+        pytest.skip("needs os.fork")
+    monkeypatch.setenv("WORKER_ID", "1")
+    ids.generator.reset()
+    parent_ids = [ids.new_id()]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # As supervisor.py does: the child only changes WORKER_ID, the fork hook resets the generator
+        os.close(read_fd)
+        os.environ["WORKER_ID"] = "2"
+        with os.fdopen(write_fd, "w") as out:
+            out.write(",".join(str(ids.new_id()) for _ in range(5000)))
+        os._exit(0)
+    os.close(write_fd)
+    parent_ids += [ids.new_id() for _ in range(5000)]
+    with os.fdopen(read_fd) as source:
+        child_ids = [int(value) for value in source.read().split(",")]
+    os.waitpid(pid, 0)
+    ids.generator.reset()
+
+    assert len(child_ids) == 5000
+    assert child_ids == sorted(child_ids)
+    assert not set(parent_ids) & set(child_ids)
+    assert {(value >> ids.SEQUENCE_BITS) & ids.MAX_WORKER_ID for value in child_ids} == {2}
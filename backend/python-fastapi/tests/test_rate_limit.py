@@ -0,0 +1,101 @@
+# FitSync AI - Rate limiter tests
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from rate_limit import GCRA_SCRIPT, RateLimit, RateLimiter
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+
+class CountingClient:
+    """Counts script round trips to Redis"""
+
+    def __init__(self, client):
+        self.client = client
+        self.round_trips = 0
+
+    async def evalsha(self, *args, **kwargs):
+        self.round_trips += 1
+        return await self.client.evalsha(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def make_limiter(limits, quota=0):
+    client = CountingClient(fakeredis.FakeAsyncRedis(decode_responses=True))
+    return RateLimiter(lambda _: client, limits, daily_token_quota=quota), client
+
+
+def test_lease_size_follows_burst():
+    assert RateLimit(limit=10, period=60).lease_size == 3
+    assert RateLimit(limit=1, period=60).lease_size == 1
+    assert RateLimit(limit=1000, period=60).lease_size == 10
+    assert RateLimit(limit=10, period=60, burst=2).lease_size == 1
+
+
+def test_burst_is_allowed_then_denied():
+    async def run():
+        limiter, client = make_limiter({"chat": RateLimit(limit=10, period=60)})
+        await client.script_load(GCRA_SCRIPT)  # no NOSCRIPT retry in the round trip count
+        decisions = [await limiter.check("u1", "chat") for _ in range(11)]
+        assert decisions[:10] == [0.0] * 10
+        # One emission interval (6 s) until the next token
+        assert 5 < decisions[10] <= 6
+        # Leases answer most requests locally, and the denial is remembered
+        assert client.round_trips == 5
+        assert await limiter.check("u1", "chat") > 0
+        assert client.round_trips == 5
+        # Other users and routes are independent
+        assert await limiter.check("u2", "chat") == 0
+        assert await limiter.check("u1", "unlimited") == 0
+
+    asyncio.run(run())
+
+
+def test_workers_share_the_redis_limit():
+    async def run():
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        limits = {"chat": RateLimit(limit=10, period=60, burst=4)}
+        workers = [RateLimiter(lambda _: client, limits, daily_token_quota=0) for _ in range(3)]
+        allowed = 0
+        for _ in range(4):
+            for worker in workers:
+                allowed += await worker.check("u1", "chat") == 0
+        assert allowed == 4
+
+    asyncio.run(run())
+
+
+def test_token_quota_blocks_until_midnight():
+    async def run():
+        limiter, _ = make_limiter({"chat": RateLimit(limit=10, period=60)}, quota=100)
+        assert await limiter.check("u1", "chat") == 0
+        await limiter.record_tokens("u1", 100)
+        with pytest.raises(HTTPException) as denied:
+            await limiter.enforce("u1", "chat")
+        assert denied.value.status_code == 429
+        assert 0 < int(denied.value.headers["Retry-After"]) <= 86400
+        # A fresh worker reads the exhausted quota from Redis
+        other = RateLimiter(limiter.get_redis, limiter.limits, daily_token_quota=100)
+        assert await other.check("u1", "chat") > 0
+
+    asyncio.run(run())
+
+
+def test_redis_errors_fail_open():
+    class Broken:
+        def register_script(self, script):
+            async def call(**kwargs):
+                raise ConnectionError("down")
+            return call
+
+    async def run():
+        limiter = RateLimiter(lambda _: Broken(), {"chat": RateLimit(limit=1, period=60)})
+        assert [await limiter.check("u1", "chat") for _ in range(3)] == [0.0] * 3
+
+    asyncio.run(run())
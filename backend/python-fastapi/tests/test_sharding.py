@@ -0,0 +1,110 @@
+# FitSync AI - Sharding tests
+
+import asyncio
+
+import pytest
+
+from sharding import DatabaseShards, HashRing, RedisShards, shard_key_for
+
+
+def test_ring_routes_consistently():
+    ring = HashRing(["a", "b", "c"])
+    assert all(ring.node_for(user) == HashRing(["c", "a", "b"]).node_for(user) for user in range(1000))
+    assert {ring.node_for(user) for user in range(1000)} == {"a", "b", "c"}
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+    moved = [user for user in range(10000) if before.node_for(user) != after.node_for(user)]
+    assert all(after.node_for(user) == "d" for user in moved)
+    # About a quarter of the keys, never a full reshuffle
+    assert 0.15 < len(moved) / 10000 < 0.35
+
+
+def test_shard_key_recovery():
+    assert shard_key_for("user_prefs:42") == "42"
+    assert shard_key_for("ratelimit:chat:42") == "42"
+    assert shard_key_for("token_quota:42:20240101") == "42"
+    assert shard_key_for("unrelated") is None
+
+
+def test_redis_migration_merges_new_writes():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+    servers = {}
+
+    def from_url(url, **kwargs):
+        return fakeredis.FakeAsyncRedis(server=servers.setdefault(url, fakeredis.FakeServer()), **kwargs)
+
+    async def run():
+        shards = RedisShards(["redis://a", "redis://b"], ["redis://a"], decode_responses=True)
+        user = next(user for user in range(1000) if shards.ring.node_for(user) == "redis://b")
+        old, new = from_url("redis://a", decode_responses=True), from_url("redis://b", decode_responses=True)
+        await old.hset(f"user_prefs:{user}", mapping={"n": 2.5})
+        await old.rpush(f"chat_history:{user}", "m1", "m2")
+        await old.set(f"token_quota:{user}:20240101", 100)
+        await new.hincrbyfloat(f"user_prefs:{user}", "n", 1)
+        await new.rpush(f"chat_history:{user}", "m3")
+        await new.incrby(f"token_quota:{user}:20240101", 7)
+
+        assert await shards.migrate() == 3
+        assert shards.failed == 0
+        assert await old.keys("*") == []
+        assert await new.hget(f"user_prefs:{user}", "n") == "3.5"
+        assert await new.lrange(f"chat_history:{user}", 0, -1) == ["m1", "m2", "m3"]
+        assert await new.get(f"token_quota:{user}:20240101") == "107"
+
+    import redis.asyncio as redis
+    original = redis.Redis.from_url
+    redis.Redis.from_url = staticmethod(from_url)
+    try:
+        asyncio.run(run())
+    finally:
+        redis.Redis.from_url = original
+
+
+def test_database_migration_moves_rows(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import func, select
+
+    from history import Base, PlanHistory
+    from ids import IdGenerator
+
+    old_url = f"sqlite+aiosqlite:///{tmp_path / 'old.db'}"
+    new_url = f"sqlite+aiosqlite:///{tmp_path / 'new.db'}"
+    generator = IdGenerator(worker_id=1)
+
+    async def count(shards, url, user_id):
+        async with shards._factory(url)() as session:
+            return await session.scalar(select(func.count()).where(PlanHistory.user_id == user_id))
+
+    async def run():
+        shards = DatabaseShards([old_url, new_url], [old_url])
+        for url in (old_url, new_url):
+            async with shards._factory(url).kw["bind"].begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        moving = next(user for user in range(1, 1000) if shards.ring.node_for(user) == new_url)
+        staying = next(user for user in range(1, 1000) if shards.ring.node_for(user) == old_url)
+        async with shards._factory(old_url)() as session:
+            for user_id in (moving, staying):
+                for _ in range(7):
+                    plan_id = generator.next_id()
+                    session.add(PlanHistory(id=plan_id, user_id=user_id, kind="workout", plan_key=f"w{plan_id}", body="{}"))
+            await session.commit()
+
+        # A row already copied by an interrupted run is not duplicated
+        async with shards._factory(old_url)() as session:
+            first = (await session.execute(select(PlanHistory).where(PlanHistory.user_id == moving).limit(1))).scalar_one()
+        async with shards._factory(new_url)() as session:
+            session.add(PlanHistory(id=first.id, user_id=moving, kind="workout", plan_key=first.plan_key, body="{}"))
+            await session.commit()
+
+        assert await shards.migrate([PlanHistory], batch=3) == 7
+        assert shards.failed == 0
+        assert await count(shards, old_url, moving) == 0
+        assert await count(shards, new_url, moving) == 7
+        assert await count(shards, old_url, staying) == 7
+        await shards.dispose()
+
+    asyncio.run(run())
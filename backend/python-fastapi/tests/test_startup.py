@@ -0,0 +1,25 @@
+# FitSync AI - Startup import tests
+
+import os
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# main.py opens database sessions only on demand, so the ORM must not load at import
+LAZY_MODULES = ("sqlalchemy", "asyncpg", "sklearn", "numpy", "openai")
+
+
+def test_main_import_keeps_heavy_modules_lazy():
+    code = (
+        "import importlib.util, sys; "
+        "spec = importlib.util.spec_from_file_location('service', 'main.py'); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec)); "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SERVICE_DIR, env=dict(os.environ, FAST_BOOT="1"), capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
@@ -0,0 +1,113 @@
+# FitSync AI - Lazy subsystem initialization
+# Heavy ML/LLM imports load in the background or on first use, never at import time
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# FAST_BOOT=1 skips background warm-up; subsystems then load on first use
+FAST_BOOT = os.getenv("FAST_BOOT", "").lower() in ("1", "true", "yes")
+
+
+class Subsystems:
+    """Registry of named subsystems created by blocking factories run in a thread"""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._required: Dict[str, bool] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._load_times: Dict[str, float] = {}
+        self._preloaded: Dict[str, Any] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], required: bool = True):
+        """Add a subsystem; optional ones do not gate readiness"""
+        self._factories[name] = factory
+        self._required[name] = required
+
+    def _start(self, name: str) -> asyncio.Task:
+        task = self._tasks.get(name)
+        if task is None:
+            task = self._tasks[name] = asyncio.create_task(self._load(name))
+        return task
+
+    async def _load(self, name: str) -> Any:
+        if name in self._preloaded:
+            return self._preloaded[name]
+        start = time.perf_counter()
+        try:
+            value = await asyncio.to_thread(self._factories[name])
+        except Exception as e:
+            logger.error(f"Subsystem {name} failed to initialize: {e}")
+            raise
+        self._load_times[name] = time.perf_counter() - start
+        logger.info(f"✅ {name} ready in {self._load_times[name]:.2f}s")
+        return value
+
+    def preload(self, names: Optional[Iterable[str]] = None):
+        """Create subsystems synchronously before forking workers, so they share the pages"""
+        for name in names or list(self._factories):
+            start = time.perf_counter()
+            try:
+                self._preloaded[name] = self._factories[name]()
+            except Exception as e:
+                # Left to load lazily in each worker
+                logger.error(f"Subsystem {name} failed to preload: {e}")
+                continue
+            self._load_times[name] = time.perf_counter() - start
+            logger.info(f"✅ {name} preloaded in {self._load_times[name]:.2f}s")
+
+    def warm_up(self):
+        """Start loading every subsystem in the background (call once the app is serving)"""
+        if FAST_BOOT:
+            logger.info("Fast boot: subsystems will load on first use")
+            return
+        for name in self._factories:
+            self._start(name)
+
+    async def get(self, name: str) -> Any:
+        """Return the subsystem, waiting for (or starting) its initialization"""
+        task = self._start(name)
+        if task.done() and task.exception() is not None:
+            # Retry failed initializations on the next request
+            del self._tasks[name]
+            task = self._start(name)
+        return await asyncio.shield(task)
+
+    def peek(self, name: str) -> Optional[Any]:
+        """The subsystem if already loaded, without triggering a load"""
+        task = self._tasks.get(name)
+        if task is not None and task.done() and task.exception() is None:
+            return task.result()
+        return None
+
+    def status(self) -> Dict[str, str]:
+        statuses = {}
+        for name in self._factories:
+            task = self._tasks.get(name)
+            if task is None:
+                statuses[name] = "idle"
+            elif not task.done():
+                statuses[name] = "warming"
+            elif task.exception() is not None:
+                statuses[name] = "failed"
+            else:
+                statuses[name] = "ready"
+        return statuses
+
+    def is_ready(self) -> bool:
+        # In fast boot, not-yet-loaded subsystems are expected and load on demand
+        acceptable = {"ready", "idle"} if FAST_BOOT else {"ready"}
+        return all(
+            status in acceptable
+            for name, status in self.status().items()
+            if self._required[name]
+        )
+
+    async def shutdown(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
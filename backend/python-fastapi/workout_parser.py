@@ -0,0 +1,128 @@
+# FitSync AI - Structured workout response parsing
+# Fast validated path from LLM JSON output to catalog exercises
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from exercise_catalog import is_exercise_allowed, lookup_exercise
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # Standard library fallback
+    import json
+    _json_loads = json.loads
+
+# Item constraints (see WORKOUT_RESPONSE_SCHEMA in prompts.py)
+MAX_SETS = 10
+MAX_REST_SECONDS = 600
+MAX_REPS_LENGTH = 32
+MAX_INSTRUCTIONS_LENGTH = 500
+DEFAULT_REST_SECONDS = 60
+
+
+@dataclass
+class ParsedWorkout:
+    exercises: List[Dict[str, Any]] = field(default_factory=list)
+    failed: int = 0
+    valid_json: bool = False
+
+
+def _extract_json(text: str) -> str:
+    # Tolerate markdown fences or prose around the object when JSON mode is unavailable
+    start = text.find("{")
+    end = text.rfind("}")
+    return text[start:end + 1] if start != -1 and end > start else text
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    # isdigit() also accepts superscripts such as "²", which int() rejects
+    if isinstance(value, str) and value.strip().isdecimal():
+        return int(value)
+    return None
+
+
+def _validate_item(item: Any) -> Optional[Dict[str, Any]]:
+    """Check one exercise item against the schema, returning normalized fields"""
+    if not isinstance(item, dict):
+        return None
+    name = item.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return None
+    sets = _as_int(item.get("sets"))
+    if sets is None or not 1 <= sets <= MAX_SETS:
+        return None
+    reps = item.get("reps")
+    if isinstance(reps, (int, float)) and not isinstance(reps, bool):
+        reps = str(int(reps))
+    if not isinstance(reps, str) or not reps.strip() or len(reps) > MAX_REPS_LENGTH:
+        return None
+    rest_seconds = _as_int(item.get("rest_seconds", DEFAULT_REST_SECONDS))
+    if rest_seconds is None or not 0 <= rest_seconds <= MAX_REST_SECONDS:
+        return None
+    instructions = item.get("instructions")
+    if not isinstance(instructions, str) or not instructions.strip():
+        instructions = None
+    return {
+        "name": name,
+        "sets": sets,
+        "reps": reps.strip(),
+        "rest_seconds": rest_seconds,
+        "instructions": instructions[:MAX_INSTRUCTIONS_LENGTH] if instructions else None,
+    }
+
+
+def parse_workout_json(
+    text: str,
+    equipment: List[str],
+    experience_level: str,
+    limit: int,
+) -> ParsedWorkout:
+    """Parse, validate and map an LLM workout response in a single pass.
+
+    Items that fail validation, do not map to a catalog exercise, need
+    unavailable equipment or repeat an earlier exercise are counted in
+    ``failed`` so the caller can fill those slots with rule-based picks.
+    """
+    result = ParsedWorkout()
+    if not text:
+        return result
+    try:
+        data = _json_loads(_extract_json(text))
+    except ValueError:
+        return result
+
+    items = data.get("exercises") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return result
+    result.valid_json = True
+
+    seen = set()
+    for item in items:
+        if len(result.exercises) >= limit:
+            break
+        fields = _validate_item(item)
+        exercise = lookup_exercise(fields["name"]) if fields else None
+        if (exercise is None or exercise["id"] in seen or
+                not is_exercise_allowed(exercise, equipment, experience_level)):
+            result.failed += 1
+            continue
+        seen.add(exercise["id"])
+        result.exercises.append({
+            "id": exercise["id"],
+            "name": exercise["name"],
+            "muscle_groups": exercise["muscle_groups"],
+            "equipment": exercise["equipment"],
+            "sets": fields["sets"],
+            "reps": fields["reps"],
+            "rest_seconds": fields["rest_seconds"],
+            "instructions": fields["instructions"] or f"Perform {exercise['name']} focusing on proper form",
+            "difficulty": exercise["difficulty"],
+        })
+    return result